@@ -0,0 +1,118 @@
+"""Measure per-request logging overhead on the event loop thread.
+
+Replays the log calls made by one /api/v1/secure/process request against
+many concurrent asyncio tasks. Three runs are reported:
+
+- before:  old f-string INFO lines, synchronous basicConfig handler
+- handler: the same f-string lines through the queue-based setup from
+           config.logging_config, isolating the handler's own overhead
+- after:   the current lazy %-style calls through the queue-based setup;
+           with the default --level INFO most of them are DEBUG and never
+           reach the handler, so this also reflects the dropped lines
+
+Only time spent inside logging calls is counted, since that is what blocks
+the event loop.
+
+Run from the API directory:
+
+    python -m benchmarks.logging_overhead --requests 20000 --concurrency 200
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+import uuid
+
+from config.logging_config import request_id_var, setup_logging, shutdown_logging
+
+PAYLOAD = {"text": "स्टार्टअप कसे सुरू करावे? " * 8, "session_id": str(uuid.uuid4()), "csrf_token": "x" * 43}
+ENCRYPTED = "eyJ0ZXh0IjogIlx1MDkzOFx1MDk0ZFx1MDkxZlx1MDkzZVx1MDkzMFx1MDk0ZFx1MDkxZlx1MDkwYSIsICJzZXNzaW9uX2lkIjog" * 4
+
+def legacy_request_logs(session_id: str, token: str) -> None:
+    logging.info(f"🔐 Secure endpoint called with encrypted data: {ENCRYPTED[:50]}...")
+    logging.info(f"🔓 Decrypted data: {PAYLOAD}")
+    logging.info(f"✅ Parsed query data - session_id: {session_id}, has_csrf: {bool(token)}, text_length: {len(PAYLOAD['text'])}")
+    logging.info(f"🔍 Processing query from session {session_id[:8]}")
+    logging.info(f"🔒 Validating CSRF token for session {session_id[:8]}")
+    logging.info(f"🔍 Validating CSRF token for session {session_id[:8]}")
+    logging.info(f"🔍 Received token: {token[:10]}...")
+    logging.info(f"🔍 Redis GET csrf:{session_id[:8]} = {token[:10]}...")
+    logging.info(f"🔍 Stored token: {token[:10]}...")
+    logging.info(f"{'✅'} CSRF token validation result: {True}")
+    logging.info(f"✅ CSRF token valid for session {session_id[:8]}")
+    logging.info(f"🔄 Using existing session {session_id[:8]}")
+
+def structured_request_logs(session_id: str, token: str) -> None:
+    logging.debug("Secure endpoint called, payload_length=%d", len(ENCRYPTED))
+    logging.debug("Parsed query data has_session=%s has_csrf=%s text_length=%d",
+                  True, bool(token), len(PAYLOAD["text"]))
+    logging.info("Processing query from session %.8s", session_id)
+    logging.debug("Redis GET csrf:%.8s found=%s", session_id, True)
+    logging.debug("CSRF token validation for session %.8s: %s", session_id, True)
+
+async def run(emit, requests: int, concurrency: int) -> list:
+    samples = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_request():
+        async with semaphore:
+            request_id_var.set(uuid.uuid4().hex)
+            session_id = str(uuid.uuid4())
+            start = time.perf_counter()
+            emit(session_id, PAYLOAD["csrf_token"])
+            samples.append(time.perf_counter() - start)
+            # Yield as a real handler would while awaiting Redis/Gemini
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(one_request() for _ in range(requests)))
+    return samples
+
+def report(name: str, samples: list) -> None:
+    samples = sorted(samples)
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"{name:<12} mean={statistics.mean(samples) * 1e6:8.1f}us  "
+          f"p50={statistics.median(samples) * 1e6:8.1f}us  p99={p99 * 1e6:8.1f}us")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-request logging overhead")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--level", default="INFO", help="Log level for the structured run")
+    parser.add_argument("--sample-rates", default="DEBUG=0.1")
+    args = parser.parse_args()
+
+    def with_basic_config(sink, emit):
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                            stream=sink, force=True)
+        return asyncio.run(run(emit, args.requests, args.concurrency))
+
+    def with_queue_logging(sink, emit, level):
+        setup_logging(level, "json", args.sample_rates, stream=sink)
+        try:
+            return asyncio.run(run(emit, args.requests, args.concurrency))
+        finally:
+            shutdown_logging()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "legacy.log"), "w", encoding="utf-8") as sink:
+            before = with_basic_config(sink, legacy_request_logs)
+        with open(os.path.join(tmp, "handler.log"), "w", encoding="utf-8") as sink:
+            handler = with_queue_logging(sink, legacy_request_logs, "INFO")
+        with open(os.path.join(tmp, "structured.log"), "w", encoding="utf-8") as sink:
+            after = with_queue_logging(sink, structured_request_logs, args.level)
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}")
+    report("before", before)
+    report("handler", handler)
+    report("after", after)
+    print(f"handler only {statistics.mean(before) / statistics.mean(handler):.1f}x  (same 12 INFO calls)")
+    print(f"overall      {statistics.mean(before) / statistics.mean(after):.1f}x  (structured calls at {args.level})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Compare in-process retrieval with scatter-gather over shard processes.
+
+Builds a synthetic embedding matrix of --rows x --dim and, for each shard
+count, starts that many shard processes, then times top-k queries from this
+process (standing in for an API worker). Reports the memory added to the
+API worker, the peak RSS of each shard, and query latency. The in-process
+baseline runs last because freed numpy memory is not reliably returned to
+the OS.
+
+Run from the API directory:
+
+    python -m benchmarks.sharded_search --rows 200000 --shards 1 2 4 8
+"""
+import argparse
+import multiprocessing
+import os
+import secrets
+import statistics
+import tempfile
+import time
+
+def rss_bytes() -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))]
+
+def make_queries(count: int, dim: int):
+    import numpy as np
+    rng = np.random.default_rng(1234)
+    queries = rng.standard_normal((count, dim), dtype=np.float32)
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+def wait_for_sockets(addresses, timeout: float = 120):
+    deadline = time.monotonic() + timeout
+    while not all(os.path.exists(address) for address in addresses):
+        if time.monotonic() > deadline:
+            raise SystemExit("Shard processes did not start in time")
+        time.sleep(0.2)
+
+def bench_sharded(shard_count: int, rows: int, dim: int, queries, k: int):
+    from config import get_settings
+    from config.shards import ShardSpec, shard_address
+    from shard_client import ShardedSearchClient
+    from shard_server import run_shard
+
+    settings = get_settings()
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as socket_dir:
+        specs = [ShardSpec(f"bench{i}", "synthetic", i, shard_count) for i in range(shard_count)]
+        per_shard = [rows // shard_count + (1 if i < rows % shard_count else 0) for i in range(shard_count)]
+        processes = [
+            ctx.Process(target=run_shard, args=(spec, size, dim, i, socket_dir), daemon=True)
+            for i, (spec, size) in enumerate(zip(specs, per_shard))
+        ]
+        for process in processes:
+            process.start()
+        try:
+            wait_for_sockets([shard_address(spec.name, socket_dir) for spec in specs])
+            before = rss_bytes()
+            client = ShardedSearchClient(specs, socket_dir, settings["shard_authkey"], timeout=30)
+            client.search(queries[0], k)
+            latencies = []
+            for query in queries:
+                start = time.perf_counter()
+                client.search(query, k)
+                latencies.append(time.perf_counter() - start)
+            worker_delta = rss_bytes() - before
+            shard_rss = [stats["max_rss_bytes"] for stats in client.stats()]
+        finally:
+            for process in processes:
+                process.terminate()
+                process.join()
+    return worker_delta, shard_rss, latencies
+
+def bench_in_process(rows: int, dim: int, queries, k: int):
+    import numpy as np
+
+    before = rss_bytes()
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((rows, dim), dtype=np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        scores = embeddings @ query
+        top = np.argpartition(-scores, k - 1)[:k]
+        top[np.argsort(-scores[top])]
+        latencies.append(time.perf_counter() - start)
+    return rss_bytes() - before, latencies
+
+def report(label: str, worker_delta: int, shard_rss, latencies):
+    shards = f"{len(shard_rss)} x {max(shard_rss) / 2**20:7.1f} MB" if shard_rss else "-"
+    print(f"{label:<12} worker +{worker_delta / 2**20:7.1f} MB   shards {shards:<18} "
+          f"p50 {statistics.median(latencies) * 1000:6.2f} ms   p95 {percentile(latencies, 95) * 1000:6.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sharded knowledge-base retrieval")
+    parser.add_argument("--rows", type=int, default=200000, help="Total knowledge-base rows")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension (MiniLM-L6 is 384)")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("-k", type=int, default=4)
+    args = parser.parse_args()
+
+    # Keep the API-side import from loading the full knowledge base
+    os.environ["SEARCH_MODE"] = "sharded"
+    # Spawned shards inherit the environment, so they share this key
+    os.environ.setdefault("SHARD_AUTHKEY", secrets.token_hex(16))
+
+    queries = make_queries(args.queries, args.dim)
+    print(f"{args.rows} rows x {args.dim} dims, {args.queries} queries, top-{args.k}")
+    for shard_count in args.shards:
+        worker_delta, shard_rss, latencies = bench_sharded(shard_count, args.rows, args.dim, queries, args.k)
+        report(f"{shard_count} shard(s)", worker_delta, shard_rss, latencies)
+    worker_delta, latencies = bench_in_process(args.rows, args.dim, queries, args.k)
+    report("in-process", worker_delta, [], latencies)
+
+if __name__ == "__main__":
+    main()
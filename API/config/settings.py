@@ -1,6 +1,8 @@
 import os
 from functools import lru_cache
 
+from .shards import default_socket_dir
+
 @lru_cache()
 def get_settings():
     return {
@@ -11,5 +13,26 @@ def get_settings():
         "redis_password": os.getenv("REDIS_PASSWORD"),
         "sentry_dsn": os.getenv("SENTRY_DSN"),
         "environment": os.getenv("ENVIRONMENT", "production"),
-        "gemini_api_key": os.getenv("GEMINI_API_KEY")
+        "gemini_api_key": os.getenv("GEMINI_API_KEY"),
+        "coalesce_enabled": os.getenv("COALESCE_ENABLED", "true").lower() == "true",
+        "coalesce_backend": os.getenv("COALESCE_BACKEND", "local"),
+        "coalesce_max_history": int(os.getenv("COALESCE_MAX_HISTORY", 2)),
+        "coalesce_wait_seconds": float(os.getenv("COALESCE_WAIT_SECONDS", 30)),
+        "kb_path": os.getenv("KB_PATH", "data/startup_knowledge.csv"),
+        "precompute_enabled": os.getenv("PRECOMPUTE_ENABLED", "true").lower() == "true",
+        "precompute_dir": os.getenv("PRECOMPUTE_DIR", "data/precomputed"),
+        "precompute_min_score": float(os.getenv("PRECOMPUTE_MIN_SCORE", 0.85)),
+        "log_level": os.getenv("LOG_LEVEL", "INFO"),
+        "log_format": os.getenv("LOG_FORMAT", "json"),
+        "log_sample_rates": os.getenv("LOG_SAMPLE_RATES", "DEBUG=0.1"),
+        "session_ttl_hours": int(os.getenv("SESSION_TTL_HOURS", 24)),
+        "session_compress_threshold": int(os.getenv("SESSION_COMPRESS_THRESHOLD", 512)),
+        "session_active_window_minutes": int(os.getenv("SESSION_ACTIVE_WINDOW_MINUTES", 30)),
+        "session_sweep_interval_seconds": int(os.getenv("SESSION_SWEEP_INTERVAL_SECONDS", 300)),
+        "csrf_orphan_grace_minutes": int(os.getenv("CSRF_ORPHAN_GRACE_MINUTES", 60)),
+        "search_mode": os.getenv("SEARCH_MODE", "local"),
+        "kb_shards": os.getenv("KB_SHARDS", ""),
+        "shard_socket_dir": os.getenv("SHARD_SOCKET_DIR") or default_socket_dir(),
+        "shard_authkey": os.getenv("SHARD_AUTHKEY", ""),
+        "shard_timeout_seconds": float(os.getenv("SHARD_TIMEOUT_SECONDS", 2.0))
     }
\ No newline at end of file
@@ -0,0 +1,105 @@
+import json
+import os
+import socket
+import stat
+import struct
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+class ShardSpec(NamedTuple):
+    name: str
+    source: str
+    partition: int = 0
+    partitions: int = 1
+
+def parse_kb_shards(spec: str, default_source: str) -> List[ShardSpec]:
+    """Parse the KB_SHARDS setting.
+
+    "funding=data/funding.csv,legal=data/legal.csv" gives each shard its own CSV.
+    "a=data/startup_knowledge.csv#0/2,b=data/startup_knowledge.csv#1/2" splits one
+    CSV by row index. A bare number such as "4" splits the default KB into that
+    many shards.
+    """
+    spec = (spec or "").strip()
+    if not spec:
+        return [ShardSpec("kb0", default_source)]
+    if spec.isdigit():
+        count = max(int(spec), 1)
+        return [ShardSpec(f"kb{i}", default_source, i, count) for i in range(count)]
+
+    shards = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, sep, source = item.partition("=")
+        if not sep or not name.strip() or not source.strip():
+            raise ValueError(f"Invalid KB_SHARDS entry: {item!r}")
+        source, _, partition = source.strip().partition("#")
+        if partition:
+            index, _, count = partition.partition("/")
+            shards.append(ShardSpec(name.strip(), source, int(index), int(count)))
+        else:
+            shards.append(ShardSpec(name.strip(), source))
+    return shards
+
+def shard_address(name: str, socket_dir: str) -> str:
+    return os.path.join(socket_dir, f"kb-{name}.sock")
+
+def default_socket_dir() -> str:
+    """Per-user runtime directory, so shard sockets never sit in a shared /tmp path"""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "chatbot-shards")
+    return os.path.join("/tmp", f"chatbot-shards-{os.getuid()}")
+
+def require_authkey(authkey: str) -> bytes:
+    if not authkey:
+        raise RuntimeError("SEARCH_MODE=sharded requires SHARD_AUTHKEY to be set")
+    return authkey.encode()
+
+def ensure_socket_dir(socket_dir: str, create: bool = False) -> None:
+    """Refuse a socket directory that another user could write to.
+
+    Shards create it with mode 0700; API workers only check it before
+    connecting, so a directory planted by another user is never trusted.
+    """
+    if create:
+        try:
+            os.mkdir(socket_dir, 0o700)
+        except FileExistsError:
+            pass
+    info = os.lstat(socket_dir)
+    if not stat.S_ISDIR(info.st_mode):
+        raise RuntimeError(f"Shard socket path {socket_dir} is not a directory")
+    if info.st_uid != os.getuid():
+        raise RuntimeError(f"Shard socket directory {socket_dir} is not owned by the current user")
+    if info.st_mode & 0o077:
+        raise RuntimeError(f"Shard socket directory {socket_dir} must not be accessible to other users")
+
+def set_io_timeout(conn, seconds: float) -> None:
+    """Bound blocking reads and writes on a multiprocessing Connection; 0 disables.
+
+    Connection uses the raw file descriptor, so a socket-level timeout
+    (SO_RCVTIMEO/SO_SNDTIMEO) is the only way to stop it blocking forever.
+    """
+    seconds = max(seconds, 0)
+    timeval = struct.pack("ll", int(seconds), int((seconds % 1) * 1_000_000))
+    if seconds and timeval == struct.pack("ll", 0, 0):
+        timeval = struct.pack("ll", 0, 1)
+    sock = socket.fromfd(conn.fileno(), socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVTIMEO, timeval)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDTIMEO, timeval)
+    finally:
+        sock.close()
+
+# Messages are a length-prefixed JSON header followed by an optional raw
+# float32 vector, so neither side ever unpickles data from the socket.
+_HEADER_LENGTH = struct.Struct("!I")
+
+def pack_message(header: Dict, payload: bytes = b"") -> bytes:
+    encoded = json.dumps(header).encode("utf-8")
+    return _HEADER_LENGTH.pack(len(encoded)) + encoded + payload
+
+def unpack_message(data: bytes) -> Tuple[Dict, Optional[bytes]]:
+    (length,) = _HEADER_LENGTH.unpack_from(data)
+    end = _HEADER_LENGTH.size + length
+    header = json.loads(data[_HEADER_LENGTH.size:end].decode("utf-8"))
+    return header, data[end:] or None
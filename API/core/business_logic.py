@@ -3,6 +3,13 @@ from datetime import datetime, timezone
 from services.session_service import session_manager
 from services.search_service import find_best_answer
 from services.llm_service import refine_with_gemini
+from services.coalescing_service import single_flight
+from services.precompute_service import precomputed_answers
+from services.monitoring_service import track_precomputed_answer
+from utils.validation import normalize_query
+from config import get_settings
+
+settings = get_settings()
 
 def get_or_create_session(session_id: str) -> Dict:
     """Get existing session or create new one"""
@@ -26,5 +33,20 @@ def process_query(text: str, history: List[Dict]) -> tuple[str, List[str]]:
     search_result = find_best_answer(text)
     raw_answer = search_result.get("answer", "")
     suggestions = search_result.get("suggestions", [])
-    refined_answer = refine_with_gemini(text, raw_answer, history)
+    row_id = search_result.get("row_id")
+
+    if precomputed_answers is not None and not history and row_id is not None:
+        precomputed = None
+        if search_result.get("score", 0.0) >= settings["precompute_min_score"]:
+            precomputed = precomputed_answers.get(row_id)
+        track_precomputed_answer(precomputed is not None)
+        if precomputed:
+            return precomputed, suggestions
+
+    if (settings["coalesce_enabled"] and row_id is not None
+            and len(history) <= settings["coalesce_max_history"]):
+        key = single_flight.make_key(normalize_query(text), row_id, history)
+        refined_answer = single_flight.do(key, lambda: refine_with_gemini(text, raw_answer, history))
+    else:
+        refined_answer = refine_with_gemini(text, raw_answer, history)
     return refined_answer, suggestions
\ No newline at end of file
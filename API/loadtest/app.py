@@ -0,0 +1,33 @@
+"""ASGI entry point that serves main:app with local stand-ins installed.
+
+Configured through environment variables so every uvicorn worker process
+patches itself identically:
+
+    LOADTEST_GEMINI_LATENCY_MS   time to first token (default 400)
+    LOADTEST_GEMINI_TOKENS_PER_SEC  generation speed (default 80)
+    LOADTEST_GEMINI_ANSWER_TOKENS   tokens per answer (default 120)
+    LOADTEST_SPEECH_LATENCY_MS   speech recognition latency (default 300)
+    LOADTEST_REDIS               "memory" (per process) or "local" (REDIS_HOST)
+    LOADTEST_RATE_LIMITS         "true" to keep slowapi limits enabled
+"""
+import os
+
+import main
+from services import llm_service, session_service
+from loadtest.stubs import FakeGeminiModel, FakeSpeechClient, InMemoryRedis
+
+llm_service.model = FakeGeminiModel(
+    latency_ms=float(os.getenv("LOADTEST_GEMINI_LATENCY_MS", 400)),
+    tokens_per_sec=float(os.getenv("LOADTEST_GEMINI_TOKENS_PER_SEC", 80)),
+    answer_tokens=int(os.getenv("LOADTEST_GEMINI_ANSWER_TOKENS", 120))
+)
+
+FakeSpeechClient.latency = float(os.getenv("LOADTEST_SPEECH_LATENCY_MS", 300)) / 1000
+main.SpeechClient = FakeSpeechClient
+
+if os.getenv("LOADTEST_REDIS", "memory") == "memory":
+    session_service.redis_client = InMemoryRedis()
+
+main.limiter.enabled = os.getenv("LOADTEST_RATE_LIMITS", "false").lower() == "true"
+
+app = main.app
@@ -0,0 +1,260 @@
+"""Drive mixed traffic against the API running with local stand-ins.
+
+Run from the API directory (needs the packages in loadtest/requirements.txt):
+
+    python -m loadtest.run --users 100 --duration 60 --workers 1
+
+Each virtual user fetches a CSRF token, then holds a multi-turn secure
+conversation, occasionally uploading a voice note. The report covers
+throughput, latency percentiles and error rates per endpoint, plus the
+resident memory of every uvicorn worker.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import httpx
+import pandas as pd
+
+from config import get_settings
+
+FALLBACK_QUESTIONS = ["स्टार्टअप कसे सुरू करावे?", "फंडिंग कसे मिळवावे?", "MVP म्हणजे काय?"]
+FAKE_AUDIO = b"\x1aE\xdf\xa3" + os.urandom(16 * 1024)
+# secure_query, refine_with_gemini and find_best_answer report failures as a
+# 200 response whose answer is an apology starting with this prefix
+FALLBACK_ANSWER_PREFIX = "माफ करा"
+
+class Stats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.rss_samples: Dict[int, List[int]] = defaultdict(list)
+
+    def record(self, endpoint: str, seconds: float, ok: bool):
+        self.latencies[endpoint].append(seconds)
+        if not ok:
+            self.errors[endpoint] += 1
+
+def load_questions() -> List[str]:
+    try:
+        df = pd.read_csv(get_settings()["kb_path"]).dropna(subset=["question"])
+        return df["question"].astype(str).tolist() or FALLBACK_QUESTIONS
+    except Exception:
+        return FALLBACK_QUESTIONS
+
+def encode(payload: dict) -> dict:
+    return {"data": base64.b64encode(json.dumps(payload).encode()).decode()}
+
+def decode(body: dict) -> dict:
+    return json.loads(base64.b64decode(body["data"]).decode())
+
+def is_failed_answer(answer) -> bool:
+    return not answer or answer.startswith(FALLBACK_ANSWER_PREFIX)
+
+async def timed(stats: Stats, endpoint: str, request):
+    start = time.perf_counter()
+    try:
+        response = await request
+        ok = response.status_code < 400
+    except httpx.HTTPError:
+        response, ok = None, False
+    stats.record(endpoint, time.perf_counter() - start, ok)
+    return response if ok else None
+
+async def virtual_user(client: httpx.AsyncClient, stats: Stats, questions: List[str],
+                       turns: int, audio_ratio: float, think_time: float, deadline: float):
+    while time.monotonic() < deadline:
+        response = await timed(stats, "csrf", client.get("/csrf-token"))
+        if response is None:
+            await asyncio.sleep(think_time)
+            continue
+        token = response.json()
+        session_id, csrf_token = token["session_id"], token["csrf_token"]
+        headers = {"X-CSRF-Token": csrf_token, "X-Session-ID": session_id}
+
+        for _ in range(turns):
+            if time.monotonic() >= deadline:
+                return
+            if random.random() < audio_ratio:
+                files = {"file": ("voice.webm", FAKE_AUDIO, "audio/webm")}
+                await timed(stats, "audio", client.post("/api/v1/secure/audio", files=files, headers=headers))
+            payload = {"text": random.choice(questions), "session_id": session_id, "csrf_token": csrf_token}
+            response = await timed(stats, "query", client.post("/api/v1/secure/process", json=encode(payload)))
+            if response is not None and is_failed_answer(decode(response.json()).get("answer")):
+                stats.errors["query"] += 1
+            await asyncio.sleep(random.expovariate(1 / think_time) if think_time > 0 else 0)
+
+def worker_pids(master_pid: int) -> List[int]:
+    """uvicorn workers are children of the master; a single-process server is the master itself"""
+    try:
+        with open(f"/proc/{master_pid}/task/{master_pid}/children") as f:
+            children = [int(pid) for pid in f.read().split()]
+    except OSError:
+        children = []
+    return children or [master_pid]
+
+def rss_bytes(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+async def sample_rss(master_pid: int, stats: Stats, deadline: float, interval: float = 1.0):
+    while time.monotonic() < deadline:
+        for pid in worker_pids(master_pid):
+            stats.rss_samples[pid].append(rss_bytes(pid))
+        await asyncio.sleep(interval)
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def build_report(stats: Stats, elapsed: float) -> dict:
+    report = {"duration_s": round(elapsed, 2), "endpoints": {}, "workers": {}}
+    all_latencies, total_errors = [], 0
+    for endpoint, latencies in sorted(stats.latencies.items()):
+        errors = stats.errors.get(endpoint, 0)
+        all_latencies.extend(latencies)
+        total_errors += errors
+        report["endpoints"][endpoint] = {
+            "requests": len(latencies),
+            "rps": round(len(latencies) / elapsed, 2),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+            "error_rate": round(errors / len(latencies), 4)
+        }
+    if all_latencies:
+        report["total"] = {
+            "requests": len(all_latencies),
+            "rps": round(len(all_latencies) / elapsed, 2),
+            "p50_ms": round(percentile(all_latencies, 50) * 1000, 1),
+            "p95_ms": round(percentile(all_latencies, 95) * 1000, 1),
+            "p99_ms": round(percentile(all_latencies, 99) * 1000, 1),
+            "error_rate": round(total_errors / len(all_latencies), 4)
+        }
+    for pid, samples in stats.rss_samples.items():
+        samples = [s for s in samples if s]
+        if samples:
+            report["workers"][str(pid)] = {
+                "rss_peak_mb": round(max(samples) / 2**20, 1),
+                "rss_last_mb": round(samples[-1] / 2**20, 1)
+            }
+    return report
+
+def print_report(report: dict):
+    print(f"\nDuration: {report['duration_s']}s")
+    print(f"{'endpoint':<8} {'requests':>9} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>8}")
+    rows = list(report["endpoints"].items())
+    if "total" in report:
+        rows.append(("total", report["total"]))
+    for name, row in rows:
+        print(f"{name:<8} {row['requests']:>9} {row['rps']:>8} {row['p50_ms']:>9} "
+              f"{row['p95_ms']:>9} {row['p99_ms']:>9} {row['error_rate']:>8.2%}")
+    for pid, worker in report["workers"].items():
+        print(f"worker {pid}: RSS peak {worker['rss_peak_mb']} MB, last {worker['rss_last_mb']} MB")
+
+def start_server(args) -> subprocess.Popen:
+    env = dict(os.environ,
+               LOADTEST_GEMINI_LATENCY_MS=str(args.gemini_latency_ms),
+               LOADTEST_GEMINI_TOKENS_PER_SEC=str(args.gemini_tokens_per_sec),
+               LOADTEST_GEMINI_ANSWER_TOKENS=str(args.gemini_answer_tokens),
+               LOADTEST_SPEECH_LATENCY_MS=str(args.speech_latency_ms),
+               LOADTEST_REDIS=args.redis,
+               LOG_LEVEL=os.getenv("LOG_LEVEL", "WARNING"))
+    command = [sys.executable, "-m", "uvicorn", "loadtest.app:app",
+               "--host", "127.0.0.1", "--port", str(args.port), "--workers", str(args.workers),
+               "--log-level", "warning"]
+    return subprocess.Popen(command, env=env)
+
+async def wait_ready(base_url: str, timeout: float):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.5)
+    raise SystemExit(f"Server did not become ready within {timeout}s")
+
+async def run(args, server_pid: int) -> dict:
+    base_url = f"http://127.0.0.1:{args.port}"
+    await wait_ready(base_url, args.startup_timeout)
+
+    stats = Stats()
+    questions = load_questions()
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.request_timeout) as client:
+        start = time.monotonic()
+        deadline = start + args.duration
+        users = [
+            virtual_user(client, stats, questions, args.turns, args.audio_ratio, args.think_time, deadline)
+            for _ in range(args.users)
+        ]
+        await asyncio.gather(sample_rss(server_pid, stats, deadline), *users)
+        elapsed = time.monotonic() - start
+    return build_report(stats, elapsed)
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test for the chatbot API")
+    parser.add_argument("--users", type=int, default=50, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="Test duration in seconds")
+    parser.add_argument("--turns", type=int, default=3, help="Queries per conversation")
+    parser.add_argument("--audio-ratio", type=float, default=0.1, help="Chance of a voice note before a query")
+    parser.add_argument("--think-time", type=float, default=0.5, help="Mean pause between turns in seconds")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--redis", choices=["memory", "local"], default="memory",
+                        help="memory: in-process fake (1 worker only); local: REDIS_HOST/REDIS_PORT")
+    parser.add_argument("--gemini-latency-ms", type=float, default=400)
+    parser.add_argument("--gemini-tokens-per-sec", type=float, default=80)
+    parser.add_argument("--gemini-answer-tokens", type=int, default=120)
+    parser.add_argument("--speech-latency-ms", type=float, default=300)
+    parser.add_argument("--request-timeout", type=float, default=60)
+    parser.add_argument("--startup-timeout", type=float, default=180)
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this JSON file")
+    parser.add_argument("--max-error-rate", type=float, default=None,
+                        help="Exit non-zero if the overall error rate exceeds this fraction")
+    args = parser.parse_args()
+
+    if args.redis == "memory" and args.workers > 1:
+        parser.error("--redis memory keeps sessions per process; use --redis local with multiple workers")
+
+    server = start_server(args)
+    try:
+        report = asyncio.run(run(args, server.pid))
+    finally:
+        server.send_signal(signal.SIGINT)
+        try:
+            server.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    error_rate = report.get("total", {}).get("error_rate", 1.0)
+    if args.max_error_rate is not None and error_rate > args.max_error_rate:
+        print(f"Error rate {error_rate:.2%} exceeds {args.max_error_rate:.2%}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
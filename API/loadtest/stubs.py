@@ -0,0 +1,204 @@
+"""Local stand-ins for Gemini, Google Speech-to-Text and Redis.
+
+They mimic just enough of each client's surface for the API to run
+unmodified, with latency knobs so the load test exercises realistic
+blocking behaviour without network access or credentials.
+"""
+import fnmatch
+import random
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, Optional, Tuple
+
+SAMPLE_ANSWER = (
+    "स्टार्टअप सुरू करण्यासाठी प्रथम एक स्पष्ट समस्या ओळखा, त्यावर उपाय तयार करा "
+    "आणि लहान MVP द्वारे बाजारात त्याची चाचणी घ्या. "
+)
+
+class FakeGeminiModel:
+    """Sleeps for a time-to-first-token plus a per-token generation time"""
+
+    def __init__(self, latency_ms: float = 400, tokens_per_sec: float = 80,
+                 answer_tokens: int = 120, jitter: float = 0.2):
+        self.latency = latency_ms / 1000
+        self.tokens_per_sec = tokens_per_sec
+        self.answer_tokens = answer_tokens
+        self.jitter = jitter
+
+    def generate_content(self, prompt: str):
+        duration = self.latency
+        if self.tokens_per_sec > 0:
+            duration += self.answer_tokens / self.tokens_per_sec
+        duration *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        time.sleep(max(duration, 0))
+        words = SAMPLE_ANSWER.split()
+        text = " ".join(words[i % len(words)] for i in range(self.answer_tokens))
+        return SimpleNamespace(text=text)
+
+class FakeSpeechClient:
+    """Drop-in for google.cloud.speech.SpeechClient used by the audio endpoints"""
+
+    latency = 0.3
+    transcript = "स्टार्टअप कसे सुरू करावे"
+
+    def recognize(self, config=None, audio=None):
+        time.sleep(self.latency * random.uniform(0.8, 1.2))
+        alternative = SimpleNamespace(transcript=self.transcript)
+        return SimpleNamespace(results=[SimpleNamespace(alternatives=[alternative])])
+
+class InMemoryRedis:
+    """Thread-safe subset of redis.Redis(decode_responses=True) with key expiry"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: Dict[str, Tuple[object, Optional[float]]] = {}
+
+    def _alive(self, key: str):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry
+
+    @staticmethod
+    def _expiry(ex=None, px=None) -> Optional[float]:
+        if px is not None:
+            return time.monotonic() + px / 1000
+        if ex is not None:
+            return time.monotonic() + ex
+        return None
+
+    def ping(self) -> bool:
+        return True
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._alive(key)
+            return entry[0] if entry else None
+
+    def set(self, key: str, value, ex=None, px=None, nx: bool = False, xx: bool = False):
+        with self._lock:
+            exists = self._alive(key) is not None
+            if (nx and exists) or (xx and not exists):
+                return None
+            self._data[key] = (value, self._expiry(ex, px))
+            return True
+
+    def setex(self, key: str, time_seconds: int, value):
+        return self.set(key, value, ex=time_seconds)
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            removed = 0
+            for key in keys:
+                if self._alive(key) is not None:
+                    del self._data[key]
+                    removed += 1
+            return removed
+
+    def exists(self, *keys: str) -> int:
+        with self._lock:
+            return sum(1 for key in keys if self._alive(key) is not None)
+
+    def ttl(self, key: str) -> int:
+        with self._lock:
+            entry = self._alive(key)
+            if entry is None:
+                return -2
+            if entry[1] is None:
+                return -1
+            return int(entry[1] - time.monotonic())
+
+    def expire(self, key: str, seconds: int) -> bool:
+        with self._lock:
+            entry = self._alive(key)
+            if entry is None:
+                return False
+            self._data[key] = (entry[0], time.monotonic() + seconds)
+            return True
+
+    def strlen(self, key: str) -> int:
+        value = self.get(key)
+        return len(value.encode("utf-8")) if isinstance(value, str) else 0
+
+    def _zset(self, key: str) -> Dict[str, float]:
+        entry = self._alive(key)
+        if entry is None:
+            zset: Dict[str, float] = {}
+            self._data[key] = (zset, None)
+            return zset
+        return entry[0]
+
+    def zadd(self, key: str, mapping: Dict[str, float]) -> int:
+        with self._lock:
+            zset = self._zset(key)
+            added = sum(1 for member in mapping if member not in zset)
+            zset.update(mapping)
+            return added
+
+    def zrem(self, key: str, *members: str) -> int:
+        with self._lock:
+            zset = self._zset(key)
+            return sum(1 for member in members if zset.pop(member, None) is not None)
+
+    @staticmethod
+    def _score(bound) -> float:
+        return {"-inf": float("-inf"), "+inf": float("inf")}.get(bound, bound)
+
+    def zrangebyscore(self, key: str, low, high) -> list:
+        low, high = self._score(low), self._score(high)
+        with self._lock:
+            items = sorted(self._zset(key).items(), key=lambda item: item[1])
+            return [member for member, score in items if low <= score <= high]
+
+    def zcount(self, key: str, low, high) -> int:
+        return len(self.zrangebyscore(key, low, high))
+
+    def zremrangebyscore(self, key: str, low, high) -> int:
+        members = self.zrangebyscore(key, low, high)
+        return self.zrem(key, *members) if members else 0
+
+    def hset(self, key: str, mapping: Dict[str, object]) -> int:
+        with self._lock:
+            entry = self._alive(key)
+            current = dict(entry[0]) if entry else {}
+            added = sum(1 for field in mapping if field not in current)
+            current.update({field: str(value) for field, value in mapping.items()})
+            self._data[key] = (current, entry[1] if entry else None)
+            return added
+
+    def hgetall(self, key: str) -> Dict[str, str]:
+        with self._lock:
+            entry = self._alive(key)
+            return dict(entry[0]) if entry else {}
+
+    def pipeline(self, transaction: bool = True) -> "_InMemoryPipeline":
+        return _InMemoryPipeline(self)
+
+    def scan_iter(self, match: str = "*", count: int = None):
+        with self._lock:
+            keys = [key for key in list(self._data) if self._alive(key) is not None and fnmatch.fnmatchcase(key, match)]
+        return iter(keys)
+
+class _InMemoryPipeline:
+    """Queues calls and runs them in order on execute(), like redis-py pipelines"""
+
+    def __init__(self, client: InMemoryRedis):
+        self._client = client
+        self._calls = []
+
+    def __getattr__(self, name: str):
+        method = getattr(self._client, name)
+
+        def queue(*args, **kwargs):
+            self._calls.append((method, args, kwargs))
+            return self
+        return queue
+
+    def execute(self) -> list:
+        calls, self._calls = self._calls, []
+        return [method(*args, **kwargs) for method, args, kwargs in calls]
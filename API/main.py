@@ -1,6 +1,8 @@
 from fastapi import FastAPI, HTTPException, UploadFile, File, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from typing import List, Dict, Optional
+import asyncio
 import logging
 import uuid
 from slowapi import Limiter, _rate_limit_exceeded_handler
@@ -9,13 +11,17 @@ from slowapi.errors import RateLimitExceeded
 from google.cloud.speech import SpeechClient, RecognitionAudio, RecognitionConfig
 
 from models import QueryRequest, QueryResponse, TranscribeRequest, TranscribeResponse, CSRFTokenResponse, EncryptedRequest, EncryptedResponse
-from services import init_sentry, MetricsMiddleware, get_metrics, track_llm_request, track_audio_transcription
+from services import init_sentry, MetricsMiddleware, RequestContextMiddleware, get_metrics, track_llm_request, track_audio_transcription
 from utils import sanitize_for_logging, validate_audio_file, generate_csrf_token, validate_csrf_token, encrypt_data, decrypt_data
 from core import get_or_create_session, update_session_history, process_query
 from config import get_settings
+from config.logging_config import setup_logging
+
+# Get settings
+settings = get_settings()
 
 # Setup logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+setup_logging(settings["log_level"], settings["log_format"], settings["log_sample_rates"])
 
 # Initialize monitoring
 init_sentry()
@@ -23,9 +29,6 @@ init_sentry()
 # Rate limiter
 limiter = Limiter(key_func=get_remote_address)
 
-# Get settings
-settings = get_settings()
-
 app = FastAPI(title="Marathi Startup Chatbot", description="A Marathi-speaking chatbot for startup information")
 
 # Add rate limiting
@@ -35,6 +38,9 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 # Add metrics middleware
 app.add_middleware(MetricsMiddleware)
 
+# Tag every log record with a per-request ID
+app.add_middleware(RequestContextMiddleware)
+
 
 
 # --- CORS Middleware ---
@@ -46,6 +52,30 @@ app.add_middleware(
     allow_headers=["Content-Type", "Authorization", "X-CSRF-Token", "X-Session-ID"],
 )
 
+# --- Background maintenance ---
+async def session_maintenance_loop():
+    """Refresh session gauges and periodically sweep stale session/CSRF keys"""
+    from services.session_service import session_manager
+
+    interval = settings["session_sweep_interval_seconds"]
+    while True:
+        try:
+            await run_in_threadpool(session_manager.sweep)
+            await run_in_threadpool(session_manager.refresh_metrics)
+        except Exception as e:
+            logging.error("Session maintenance failed: %s", e)
+        await asyncio.sleep(interval)
+
+@app.on_event("startup")
+async def start_session_maintenance():
+    app.state.session_maintenance = asyncio.create_task(session_maintenance_loop())
+
+@app.on_event("shutdown")
+async def stop_session_maintenance():
+    task = getattr(app.state, "session_maintenance", None)
+    if task:
+        task.cancel()
+
 # --- API Endpoints ---
 @app.get("/")
 async def root():
@@ -59,35 +89,33 @@ async def root():
 async def secure_query(request: Request, encrypted_request: EncryptedRequest):
     """Encrypted query endpoint"""
     try:
-        logging.info(f"🔐 Secure endpoint called with encrypted data: {encrypted_request.data[:50]}...")
+        logging.debug("Secure endpoint called, payload_length=%d", len(encrypted_request.data))
         
         # Decrypt request
         try:
             decrypted_data = decrypt_data(encrypted_request.data)
-            logging.info(f"🔓 Decrypted data: {decrypted_data}")
         except Exception as e:
-            logging.error(f"❌ Failed to decrypt data: {e}")
+            logging.error("Failed to decrypt data: %s", e)
             raise HTTPException(status_code=400, detail="Failed to decrypt request")
         
         try:
             query_data = QueryRequest(**decrypted_data)
-            logging.info(f"✅ Parsed query data - session_id: {query_data.session_id}, has_csrf: {bool(query_data.csrf_token)}, text_length: {len(query_data.text) if query_data.text else 0}")
+            logging.debug("Parsed query data has_session=%s has_csrf=%s text_length=%d",
+                          bool(query_data.session_id), bool(query_data.csrf_token), len(query_data.text or ""))
         except Exception as e:
-            logging.error(f"❌ Failed to parse query data: {e}")
+            logging.error("Failed to parse query data: %s", e)
             raise HTTPException(status_code=400, detail="Invalid request format")
         
         session_id = query_data.session_id or str(uuid.uuid4())
-        logging.info(f"🔍 Processing query from session {session_id[:8]}")
+        logging.info("Processing query from session %.8s", session_id)
         
         # Simplified CSRF validation - only validate if both session_id and csrf_token are provided
         if query_data.session_id and query_data.csrf_token:
-            logging.info(f"🔒 Validating CSRF token for session {query_data.session_id[:8]}")
             if not validate_csrf_token(query_data.csrf_token, query_data.session_id):
-                logging.error(f"❌ Invalid CSRF token for session {query_data.session_id[:8]}")
+                logging.warning("Invalid CSRF token for session %.8s", query_data.session_id)
                 raise HTTPException(status_code=403, detail="Invalid CSRF token")
-            logging.info(f"✅ CSRF token valid for session {query_data.session_id[:8]}")
         else:
-            logging.info(f"🆕 No CSRF validation - treating as new session")
+            logging.debug("No CSRF validation - treating as new session")
         
         if not query_data.text or not query_data.text.strip():
             raise HTTPException(status_code=400, detail="Query text cannot be empty")
@@ -96,15 +124,12 @@ async def secure_query(request: Request, encrypted_request: EncryptedRequest):
         
         # Generate CSRF token for new sessions
         if not query_data.session_id:
-            logging.info(f"🆕 Generating CSRF token for new session {session_id[:8]}")
             csrf_token = generate_csrf_token()
             from services.session_service import session_manager
             session_manager.set_csrf_token(session_id, csrf_token)
-            logging.info(f"✅ CSRF token generated and stored for session {session_id[:8]}")
-        else:
-            logging.info(f"🔄 Using existing session {session_id[:8]}")
+            logging.debug("CSRF token generated for new session %.8s", session_id)
         
-        refined_answer, suggestions = process_query(query_data.text, session["history"])
+        refined_answer, suggestions = await run_in_threadpool(process_query, query_data.text, session["history"])
         update_session_history(session_id, query_data.text, refined_answer)
         
         track_llm_request(True)
@@ -120,10 +145,10 @@ async def secure_query(request: Request, encrypted_request: EncryptedRequest):
         return EncryptedResponse(data=encrypted_response)
         
     except HTTPException as he:
-        logging.error(f"❌ HTTPException in secure endpoint: {he.status_code} - {he.detail}")
+        logging.warning("HTTPException in secure endpoint: %s - %s", he.status_code, he.detail)
         raise
     except Exception as e:
-        logging.error(f"❌ Unexpected error in secure endpoint: {e}", exc_info=True)
+        logging.error("Unexpected error in secure endpoint: %s", e, exc_info=True)
         track_llm_request(False)
         error_response = {
             "answer": "माफ करा, सर्वरमध्ये समस्या आली आहे. कृपया पुन्हा प्रयत्न करा.",
@@ -178,7 +203,7 @@ async def secure_transcribe(request: Request, file: UploadFile = File(...)):
     except HTTPException:
         raise
     except Exception as e:
-        logging.error(f"❌ Error in secure transcription: {e}", exc_info=True)
+        logging.error("Error in secure transcription: %s", e, exc_info=True)
         track_audio_transcription(False)
         raise HTTPException(status_code=500, detail="Failed to transcribe audio")
 
@@ -191,14 +216,11 @@ async def get_csrf_token(request: Request):
     session_id = str(uuid.uuid4())
     csrf_token = generate_csrf_token()
     
-    logging.info(f"🔑 Generating new CSRF token for session {session_id[:8]}")
-    logging.info(f"🔑 CSRF token: {csrf_token[:10]}...")
-    
     try:
         session_manager.set_csrf_token(session_id, csrf_token)
-        logging.info(f"✅ CSRF token stored successfully for session {session_id[:8]}")
+        logging.debug("CSRF token issued for session %.8s", session_id)
     except Exception as e:
-        logging.error(f"❌ Failed to store CSRF token: {e}")
+        logging.error("Failed to store CSRF token: %s", e)
         raise HTTPException(status_code=500, detail="Failed to generate CSRF token")
     
     return {"csrf_token": csrf_token, "session_id": session_id}
@@ -218,14 +240,15 @@ async def health_check():
         session_manager.redis_client.ping()
         return {"status": "healthy", "redis": "connected"}
     except Exception as e:
-        logging.error(f"Health check failed: {e}")
+        logging.error("Health check failed: %s", e)
         return {"status": "unhealthy", "redis": "disconnected"}
 
 @app.post("/transcribe", response_model=TranscribeResponse)
 @limiter.limit("5/minute")
 async def transcribe_audio(request: Request, file: UploadFile = File(...)):
     """Transcribes audio in Marathi using Google Cloud Speech-to-Text."""
-    logging.info(f"Received audio file: {sanitize_for_logging(file.filename or 'unknown')}, Content-Type: {file.content_type}")
+    logging.info("Received audio file: %s, Content-Type: %s",
+                 sanitize_for_logging(file.filename or 'unknown'), file.content_type)
     
     # Get CSRF token and session ID from headers
     csrf_token = request.headers.get("X-CSRF-Token")
@@ -237,12 +260,12 @@ async def transcribe_audio(request: Request, file: UploadFile = File(...)):
     
     # Validate file
     if not validate_audio_file(file):
-        error_msg = f"Invalid audio file - filename: {sanitize_for_logging(file.filename or 'unknown')}, content_type: {file.content_type}"
-        logging.error(error_msg)
+        logging.error("Invalid audio file - filename: %s, content_type: %s",
+                      sanitize_for_logging(file.filename or 'unknown'), file.content_type)
         raise HTTPException(status_code=400, detail="Invalid audio file type or size")
     
     # Log file details for debugging
-    logging.info(f"File size: {file.size if hasattr(file, 'size') else 'unknown'}")
+    logging.info("File size: %s", getattr(file, 'size', 'unknown'))
     
     try:
         client = SpeechClient()
@@ -266,7 +289,7 @@ async def transcribe_audio(request: Request, file: UploadFile = File(...)):
             return {"transcript": ""}
 
         transcript = response.results[0].alternatives[0].transcript
-        logging.info(f"Transcription successful: {transcript}")
+        logging.info("Transcription successful, transcript_length=%d", len(transcript))
         
         # Track successful transcription
         track_audio_transcription(True)
@@ -274,15 +297,15 @@ async def transcribe_audio(request: Request, file: UploadFile = File(...)):
         return {"transcript": transcript}
 
     except FileNotFoundError as e:
-        logging.error(f"❌ Audio file not found: {e}")
+        logging.error("Audio file not found: %s", e)
         track_audio_transcription(False)
         raise HTTPException(status_code=400, detail="Audio file not found")
     except ValueError as e:
-        logging.error(f"❌ Invalid audio format: {e}")
+        logging.error("Invalid audio format: %s", e)
         track_audio_transcription(False)
         raise HTTPException(status_code=400, detail="Invalid audio format")
     except Exception as e:
-        logging.error(f"❌ Error during transcription: {e}", exc_info=True)
+        logging.error("Error during transcription: %s", e, exc_info=True)
         track_audio_transcription(False)
         raise HTTPException(status_code=500, detail="Failed to transcribe audio")
 
@@ -293,7 +316,7 @@ async def handle_query(request: Request, query: QueryRequest):
     """Handle user queries and return responses in Marathi"""
     try:
         session_id = query.session_id or str(uuid.uuid4())
-        logging.info(f"Query from session {session_id[:8]}: {sanitize_for_logging(query.text, 50)}")
+        logging.info("Query from session %.8s text_length=%d", session_id, len(query.text or ""))
         
         # Validate CSRF token for existing sessions
         if query.session_id and query.csrf_token:
@@ -313,13 +336,13 @@ async def handle_query(request: Request, query: QueryRequest):
             from services.session_service import session_manager
             session_manager.set_csrf_token(session_id, csrf_token)
         
-        refined_answer, suggestions = process_query(query.text, session["history"])
+        refined_answer, suggestions = await run_in_threadpool(process_query, query.text, session["history"])
         update_session_history(session_id, query.text, refined_answer)
         
         # Track successful LLM request
         track_llm_request(True)
         
-        logging.info(f"LLM Response to {session_id[:8]}: {sanitize_for_logging(refined_answer, 100)}")
+        logging.info("LLM response to session %.8s answer_length=%d", session_id, len(refined_answer))
         
         return {
             "answer": refined_answer,
@@ -329,15 +352,15 @@ async def handle_query(request: Request, query: QueryRequest):
     except HTTPException:
         raise
     except ValueError as e:
-        logging.error(f"❌ Invalid input in /query endpoint: {e}")
+        logging.error("Invalid input in /query endpoint: %s", e)
         track_llm_request(False)
         raise HTTPException(status_code=400, detail="Invalid input provided")
     except KeyError as e:
-        logging.error(f"❌ Missing required data in /query endpoint: {e}")
+        logging.error("Missing required data in /query endpoint: %s", e)
         track_llm_request(False)
         raise HTTPException(status_code=400, detail="Missing required information")
     except Exception as e:
-        logging.error(f"❌ Unexpected error in /query endpoint: {e}", exc_info=True)
+        logging.error("Unexpected error in /query endpoint: %s", e, exc_info=True)
         track_llm_request(False)
         return {
             "answer": "माफ करा, सर्वरमध्ये समस्या आली आहे. कृपया पुन्हा प्रयत्न करा.",
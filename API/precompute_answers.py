@@ -0,0 +1,130 @@
+"""Pre-generate refined Marathi answers for every knowledge-base row.
+
+Run from the API directory:
+
+    python precompute_answers.py --workers 4
+
+The artifact is written to PRECOMPUTE_DIR and named after the knowledge base
+hash. Re-running the job resumes from the existing artifact and only calls
+Gemini for rows that are still missing; use --force to regenerate everything.
+"""
+import argparse
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+import pandas as pd
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from config import get_settings
+import gemini_client
+from precompute_artifacts import (
+    ARTIFACT_VERSION, artifact_path, compute_kb_hash, compute_prompt_hash, load_artifact, save_artifact
+)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+settings = get_settings()
+
+def refine_row(question: str, raw_answer: str) -> str:
+    """Refine one KB row as a first-turn query; raises instead of returning an apology"""
+    if gemini_client.model is None:
+        raise RuntimeError("Gemini model is not configured")
+    response = gemini_client.model.generate_content(
+        gemini_client.build_refinement_prompt(question, raw_answer, [])
+    )
+    if not response or not response.text:
+        raise ValueError("Empty response from Gemini")
+    return response.text.strip()
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute refined answers for the knowledge base")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent Gemini calls")
+    parser.add_argument("--checkpoint-every", type=int, default=10, help="Save progress every N answers")
+    parser.add_argument("--limit", type=int, default=None, help="Only process the first N missing rows")
+    parser.add_argument("--force", action="store_true", help="Ignore existing progress and regenerate all rows")
+    args = parser.parse_args()
+
+    kb_path = settings["kb_path"]
+    kb_hash = compute_kb_hash(kb_path)
+    if not kb_hash:
+        raise SystemExit(1)
+
+    df = pd.read_csv(kb_path)
+    df = df.dropna(subset=["question", "answer"])
+    df["question"] = df["question"].astype(str)
+
+    path = artifact_path(kb_hash)
+    prompt_hash = compute_prompt_hash()
+    artifact = None if args.force else load_artifact(path)
+    if artifact and (artifact.get("version") != ARTIFACT_VERSION or artifact.get("prompt_hash") != prompt_hash):
+        logging.info("Existing artifact was built with a different prompt or format, starting over")
+        artifact = None
+    if artifact is None:
+        artifact = {
+            "version": ARTIFACT_VERSION,
+            "kb_hash": kb_hash,
+            "prompt_hash": prompt_hash,
+            "answers": {}
+        }
+
+    answers = artifact["answers"]
+    pending = [(int(row_id), row) for row_id, row in df.iterrows() if str(row_id) not in answers]
+    if args.limit is not None:
+        pending = pending[:args.limit]
+    logging.info(f"{len(answers)} answers already present, {len(pending)} rows to refine -> {path}")
+
+    completed = 0
+    failed = 0
+
+    def checkpoint():
+        artifact["updated_at"] = datetime.now(timezone.utc).isoformat()
+        save_artifact(path, artifact)
+
+    workers = max(1, args.workers)
+    rows = iter(pending)
+    in_flight = {}
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    def submit_next() -> None:
+        for row_id, row in rows:
+            in_flight[executor.submit(refine_row, row["question"], str(row["answer"]))] = row_id
+            return
+
+    # Only a small window is queued, so an interrupt does not leave hundreds of
+    # paid Gemini calls running in the background
+    try:
+        for _ in range(workers * 2):
+            submit_next()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                row_id = in_flight.pop(future)
+                submit_next()
+                try:
+                    refined = future.result()
+                except Exception as e:
+                    failed += 1
+                    logging.error(f"Failed to refine row {row_id}: {e}")
+                    continue
+                answers[str(row_id)] = refined
+                completed += 1
+                if completed % args.checkpoint_every == 0:
+                    checkpoint()
+                    logging.info(f"Progress: {completed}/{len(pending)} refined")
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        # Keep answers from calls that were already running when interrupted
+        for future, row_id in in_flight.items():
+            if not future.cancelled() and future.exception() is None:
+                answers[str(row_id)] = future.result()
+        checkpoint()
+
+    logging.info(f"Done: {completed} refined, {failed} failed, {len(answers)}/{len(df)} rows covered")
+    if failed:
+        logging.info("Re-run the job to retry failed rows")
+
+if __name__ == "__main__":
+    main()
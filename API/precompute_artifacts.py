@@ -0,0 +1,50 @@
+"""Versioned artifact of precomputed answers, shared by the API and precompute_answers.py"""
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+import logging
+from config import get_settings
+from gemini_client import build_refinement_prompt
+
+settings = get_settings()
+
+ARTIFACT_VERSION = 1
+
+def compute_kb_hash(kb_path: str) -> Optional[str]:
+    """SHA-256 of the knowledge base file, used to version precomputed answers"""
+    try:
+        digest = hashlib.sha256()
+        with open(kb_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    except OSError as e:
+        logging.error(f"Failed to hash knowledge base {kb_path}: {e}")
+        return None
+
+def compute_prompt_hash() -> str:
+    """Fingerprint of the refinement prompt template so prompt edits invalidate artifacts"""
+    template = build_refinement_prompt("{query}", "{raw_answer}", [])
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()
+
+def artifact_path(kb_hash: str, directory: Optional[str] = None) -> str:
+    return os.path.join(directory or settings["precompute_dir"], f"answers-{kb_hash[:16]}.json")
+
+def load_artifact(path: str) -> Optional[Dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logging.error(f"Failed to read precomputed answers {path}: {e}")
+        return None
+
+def save_artifact(path: str, artifact: Dict) -> None:
+    """Atomically write the artifact so a crash never leaves a truncated file"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(artifact, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
@@ -1,7 +1,7 @@
 from .search_service import find_best_answer
 from .llm_service import refine_with_gemini
 from .session_service import session_manager
-from .monitoring_service import init_sentry, MetricsMiddleware, get_metrics, track_llm_request, track_audio_transcription
+from .monitoring_service import init_sentry, MetricsMiddleware, RequestContextMiddleware, get_metrics, track_llm_request, track_audio_transcription, track_coalesced_request
 
 __all__ = [
     "find_best_answer",
@@ -9,7 +9,9 @@ __all__ = [
     "session_manager",
     "init_sentry",
     "MetricsMiddleware",
+    "RequestContextMiddleware",
     "get_metrics",
     "track_llm_request",
-    "track_audio_transcription"
+    "track_audio_transcription",
+    "track_coalesced_request"
 ]
\ No newline at end of file
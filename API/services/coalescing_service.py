@@ -0,0 +1,126 @@
+import hashlib
+import json
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+import logging
+from config import get_settings
+from services.monitoring_service import track_coalesced_request
+
+settings = get_settings()
+
+class _InFlightCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """Collapse identical concurrent refinements into a single LLM call.
+
+    Callers inside one worker wait on the first caller's result. With the
+    "redis" backend the leader of each worker additionally takes a short
+    Redis lock so that only one worker across the deployment calls the LLM,
+    while the others poll for the published result.
+    """
+
+    def __init__(self, backend: str = "local", wait_seconds: float = 30.0,
+                 lock_prefix: str = "inflight", poll_interval: float = 0.05):
+        self.backend = backend
+        self.wait_seconds = wait_seconds
+        self.lock_prefix = lock_prefix
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _InFlightCall] = {}
+
+    @staticmethod
+    def make_key(normalized_query: str, row_id: int, history: List[Dict]) -> str:
+        history_json = json.dumps(history, ensure_ascii=False, sort_keys=True, default=str)
+        raw = f"{normalized_query}\x1f{row_id}\x1f{history_json}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def do(self, key: str, fn: Callable[[], str]) -> str:
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _InFlightCall()
+                self._calls[key] = call
+
+        if not is_leader:
+            track_coalesced_request("local", "follower")
+            if call.done.wait(self.wait_seconds):
+                if call.error is not None:
+                    raise call.error
+                return call.result
+            logging.warning(f"Single-flight wait timed out for key {key[:12]}, calling LLM directly")
+            return fn()
+
+        track_coalesced_request("local", "leader")
+        try:
+            if self.backend == "redis":
+                call.result = self._do_redis(key, fn)
+            else:
+                call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def _do_redis(self, key: str, fn: Callable[[], str]) -> str:
+        from services.session_service import redis_client
+
+        lock_key = f"{self.lock_prefix}:lock:{key}"
+        result_key = f"{self.lock_prefix}:result:{key}"
+        ttl_ms = int(self.wait_seconds * 1000)
+        owner = uuid.uuid4().hex
+
+        try:
+            acquired = redis_client.set(lock_key, owner, nx=True, px=ttl_ms)
+        except Exception as e:
+            logging.error(f"Redis single-flight lock error: {e}")
+            return fn()
+
+        if acquired:
+            track_coalesced_request("redis", "leader")
+            try:
+                result = fn()
+                try:
+                    redis_client.set(result_key, result, px=ttl_ms)
+                except Exception as e:
+                    logging.error(f"Redis single-flight publish error: {e}")
+                return result
+            finally:
+                try:
+                    if redis_client.get(lock_key) == owner:
+                        redis_client.delete(lock_key)
+                except Exception as e:
+                    logging.error(f"Redis single-flight unlock error: {e}")
+
+        track_coalesced_request("redis", "follower")
+        deadline = time.monotonic() + self.wait_seconds
+        try:
+            while time.monotonic() < deadline:
+                result = redis_client.get(result_key)
+                if result is not None:
+                    return result
+                if not redis_client.exists(lock_key):
+                    # Leader finished without publishing (or died); don't keep waiting
+                    result = redis_client.get(result_key)
+                    if result is not None:
+                        return result
+                    break
+                time.sleep(self.poll_interval)
+        except Exception as e:
+            logging.error(f"Redis single-flight poll error: {e}")
+        return fn()
+
+single_flight = SingleFlight(
+    backend=settings["coalesce_backend"],
+    wait_seconds=settings["coalesce_wait_seconds"]
+)
@@ -3,8 +3,11 @@ from sentry_sdk.integrations.fastapi import FastApiIntegration
 from sentry_sdk.integrations.logging import LoggingIntegration
 from prometheus_client import Counter, Histogram, Gauge, generate_latest
 import time
+import threading
+import uuid
 import logging
 from config import get_settings
+from config.logging_config import request_id_var, dropped_log_records
 
 settings = get_settings()
 
@@ -24,8 +27,20 @@ def init_sentry():
 REQUEST_COUNT = Counter('http_requests_total', 'Total HTTP requests', ['method', 'endpoint', 'status'])
 REQUEST_DURATION = Histogram('http_request_duration_seconds', 'HTTP request duration', ['method', 'endpoint'])
 ACTIVE_SESSIONS = Gauge('active_sessions_total', 'Number of active sessions')
+STORED_SESSIONS = Gauge('stored_sessions_total', 'Sessions currently held in Redis')
+SESSION_STORAGE_BYTES = Gauge('session_storage_bytes', 'Bytes of session payloads held in Redis')
+SESSION_PAYLOAD_BYTES = Histogram('session_payload_bytes', 'Size of session payloads written to Redis',
+                                  buckets=(256, 512, 1024, 2048, 4096, 8192, 16384, 32768, 65536))
 LLM_REQUESTS = Counter('llm_requests_total', 'Total LLM requests', ['status'])
 AUDIO_TRANSCRIPTIONS = Counter('audio_transcriptions_total', 'Total audio transcriptions', ['status'])
+COALESCED_REQUESTS = Counter('llm_coalesced_requests_total', 'Query refinements by single-flight role', ['scope', 'role'])
+COALESCING_RATIO = Gauge('llm_coalescing_ratio', 'Fraction of coalescable refinements served from another caller', ['scope'])
+PRECOMPUTED_ANSWERS = Counter('precomputed_answers_total', 'First-turn queries checked against precomputed answers', ['status'])
+LOG_RECORDS_DROPPED = Gauge('log_records_dropped_total', 'Log records dropped because the log queue was full')
+LOG_RECORDS_DROPPED.set_function(dropped_log_records)
+
+_coalesce_totals = {}
+_coalesce_lock = threading.Lock()
 
 class MetricsMiddleware:
     def __init__(self, app):
@@ -52,6 +67,34 @@ class MetricsMiddleware:
         
         await self.app(scope, receive, send_wrapper)
 
+class RequestContextMiddleware:
+    """Assign each HTTP request an ID (honouring X-Request-ID) for structured logs"""
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", []):
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", []).append((b"x-request-id", request_id.encode("latin-1")))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
+
 def get_metrics():
     return generate_latest()
 
@@ -64,4 +107,24 @@ def track_audio_transcription(success: bool):
     AUDIO_TRANSCRIPTIONS.labels(status=status).inc()
 
 def update_active_sessions(count: int):
-    ACTIVE_SESSIONS.set(count)
\ No newline at end of file
+    ACTIVE_SESSIONS.set(count)
+
+def update_session_storage(count: int, size_bytes: int):
+    STORED_SESSIONS.set(count)
+    SESSION_STORAGE_BYTES.set(size_bytes)
+
+def track_session_write(size_bytes: int):
+    SESSION_PAYLOAD_BYTES.observe(size_bytes)
+
+def track_precomputed_answer(hit: bool):
+    status = "hit" if hit else "miss"
+    PRECOMPUTED_ANSWERS.labels(status=status).inc()
+
+def track_coalesced_request(scope: str, role: str):
+    """Record a single-flight leader/follower and refresh the coalescing ratio"""
+    COALESCED_REQUESTS.labels(scope=scope, role=role).inc()
+    with _coalesce_lock:
+        totals = _coalesce_totals.setdefault(scope, {"leader": 0, "follower": 0})
+        totals[role] = totals.get(role, 0) + 1
+        total = totals["leader"] + totals["follower"]
+        COALESCING_RATIO.labels(scope=scope).set(totals["follower"] / total)
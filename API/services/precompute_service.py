@@ -0,0 +1,34 @@
+from typing import Dict, Optional
+import logging
+from config import get_settings
+from precompute_artifacts import ARTIFACT_VERSION, artifact_path, compute_kb_hash, compute_prompt_hash, load_artifact
+
+settings = get_settings()
+
+class PrecomputedAnswers:
+    """Serves refined answers generated offline for each knowledge-base row"""
+
+    def __init__(self, kb_path: str, directory: Optional[str] = None):
+        self.answers: Dict[int, str] = {}
+        kb_hash = compute_kb_hash(kb_path)
+        if not kb_hash:
+            return
+
+        path = artifact_path(kb_hash, directory)
+        artifact = load_artifact(path)
+        if artifact is None:
+            logging.info(f"No precomputed answers for knowledge base {kb_hash[:12]}, using live refinement")
+            return
+        if (artifact.get("version") != ARTIFACT_VERSION
+                or artifact.get("kb_hash") != kb_hash
+                or artifact.get("prompt_hash") != compute_prompt_hash()):
+            logging.warning(f"Precomputed answers at {path} are stale, ignoring them")
+            return
+
+        self.answers = {int(row_id): answer for row_id, answer in artifact.get("answers", {}).items()}
+        logging.info(f"Loaded {len(self.answers)} precomputed answers for knowledge base {kb_hash[:12]}")
+
+    def get(self, row_id: int) -> Optional[str]:
+        return self.answers.get(row_id)
+
+precomputed_answers = PrecomputedAnswers(settings["kb_path"]) if settings["precompute_enabled"] else None
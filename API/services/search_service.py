@@ -1,6 +1,11 @@
 import pandas as pd
 from sentence_transformers import SentenceTransformer, util
 import logging
+from config import get_settings
+from config.shards import parse_kb_shards
+from shard_client import ShardedSearchClient
+
+settings = get_settings()
 
 try:
     model = SentenceTransformer("all-MiniLM-L6-v2")
@@ -15,31 +20,68 @@ except Exception as e:
     logging.error(f"Unexpected error loading SentenceTransformer model: {e}")
     model = None
 
-try:
-    df = pd.read_csv("data/startup_knowledge.csv")
-    df = df.dropna(subset=["question", "answer"])
-    df["question"] = df["question"].astype(str)
-    
-    if model is not None:
-        df["embedding"] = df["question"].apply(lambda x: model.encode(x, convert_to_tensor=True))
-        logging.info(f"Knowledge base loaded with {len(df)} entries")
-    else:
-        df["embedding"] = None
-except FileNotFoundError as e:
-    logging.error(f"Knowledge base CSV file not found: {e}")
-    df = pd.DataFrame()
-except pd.errors.EmptyDataError as e:
-    logging.error(f"Knowledge base CSV file is empty: {e}")
-    df = pd.DataFrame()
-except KeyError as e:
-    logging.error(f"Required columns missing in knowledge base: {e}")
-    df = pd.DataFrame()
-except Exception as e:
-    logging.error(f"Unexpected error loading knowledge base: {e}")
+if settings["search_mode"] == "sharded":
+    # Embeddings live in the shard processes started by shard_server.py
     df = pd.DataFrame()
+    shard_client = ShardedSearchClient(
+        parse_kb_shards(settings["kb_shards"], settings["kb_path"]),
+        settings["shard_socket_dir"],
+        settings["shard_authkey"],
+        settings["shard_timeout_seconds"]
+    )
+    logging.info(f"Sharded search across {len(shard_client.addresses)} shards")
+else:
+    shard_client = None
+    try:
+        df = pd.read_csv(settings["kb_path"])
+        df = df.dropna(subset=["question", "answer"])
+        df["question"] = df["question"].astype(str)
+    
+        if model is not None:
+            df["embedding"] = df["question"].apply(lambda x: model.encode(x, convert_to_tensor=True))
+            logging.info(f"Knowledge base loaded with {len(df)} entries")
+        else:
+            df["embedding"] = None
+    except FileNotFoundError as e:
+        logging.error(f"Knowledge base CSV file not found: {e}")
+        df = pd.DataFrame()
+    except pd.errors.EmptyDataError as e:
+        logging.error(f"Knowledge base CSV file is empty: {e}")
+        df = pd.DataFrame()
+    except KeyError as e:
+        logging.error(f"Required columns missing in knowledge base: {e}")
+        df = pd.DataFrame()
+    except Exception as e:
+        logging.error(f"Unexpected error loading knowledge base: {e}")
+        df = pd.DataFrame()
+
+def _find_best_answer_sharded(user_query: str) -> dict:
+    if model is None:
+        return {
+            "answer": "माफ करा, ज्ञान आधार उपलब्ध नाही. कृपया सिस्टम तपासा.",
+            "suggestions": []
+        }
+
+    query_vec = model.encode(user_query, convert_to_numpy=True, normalize_embeddings=True)
+    top_matches = shard_client.search(query_vec, k=4)
+    if not top_matches:
+        return {
+            "answer": "माफ करा, ज्ञान आधार उपलब्ध नाही. कृपया सिस्टम तपासा.",
+            "suggestions": []
+        }
+
+    return {
+        "answer": top_matches[0]["answer"],
+        "suggestions": [match["question"] for match in top_matches[1:]],
+        "row_id": top_matches[0]["row_id"],
+        "score": top_matches[0]["score"]
+    }
 
 def find_best_answer(user_query: str) -> dict:
     try:
+        if shard_client is not None:
+            return _find_best_answer_sharded(user_query)
+
         if model is None or df.empty:
             return {
                 "answer": "माफ करा, ज्ञान आधार उपलब्ध नाही. कृपया सिस्टम तपासा.",
@@ -57,7 +99,9 @@ def find_best_answer(user_query: str) -> dict:
 
         return {
             "answer": answer,
-            "suggestions": similar_questions
+            "suggestions": similar_questions,
+            "row_id": int(top_matches.index[0]),
+            "score": scores[top_indices[0]]
         }
     except Exception as e:
         logging.error(f"Error in find_best_answer: {e}")
@@ -1,9 +1,13 @@
 import redis
 import json
+import base64
+import time
+import zlib
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional
 import logging
 from config import get_settings
+from services.monitoring_service import track_session_write, update_active_sessions, update_session_storage
 
 settings = get_settings()
 
@@ -15,15 +19,66 @@ redis_client = redis.Redis(
     decode_responses=True
 )
 
+ACTIVE_SESSIONS_KEY = "sessions:active"
+SESSION_STATS_KEY = "sessions:stats"
+SWEEP_LOCK_KEY = "sessions:sweep:lock"
+
+# Session blobs are stored with one-letter keys; "j:" marks compact JSON and
+# "z:" zlib-compressed compact JSON (base85 because the client decodes to str).
+# Anything starting with "{" is a legacy plain-JSON session.
+_FIELD_NAMES = {"history": "h", "created_at": "c", "role": "r", "content": "t"}
+_ROLE_NAMES = {"user": "u", "assistant": "a"}
+_FIELD_NAMES_REVERSE = {short: name for name, short in _FIELD_NAMES.items()}
+_ROLE_NAMES_REVERSE = {short: name for name, short in _ROLE_NAMES.items()}
+
+def _shorten(data: Dict) -> Dict:
+    packed = {_FIELD_NAMES.get(key, key): value for key, value in data.items()}
+    if isinstance(packed.get("h"), list):
+        packed["h"] = [
+            {_FIELD_NAMES.get(k, k): (_ROLE_NAMES.get(v, v) if k == "role" else v) for k, v in message.items()}
+            for message in packed["h"]
+        ]
+    return packed
+
+def _expand(packed: Dict) -> Dict:
+    data = {_FIELD_NAMES_REVERSE.get(key, key): value for key, value in packed.items()}
+    if isinstance(data.get("history"), list):
+        data["history"] = [
+            {_FIELD_NAMES_REVERSE.get(k, k): (_ROLE_NAMES_REVERSE.get(v, v) if k == "r" else v) for k, v in message.items()}
+            for message in data["history"]
+        ]
+    return data
+
+def encode_session(data: Dict, compress_threshold: int) -> str:
+    payload = json.dumps(_shorten(data), ensure_ascii=False, separators=(",", ":"), default=str)
+    raw = payload.encode("utf-8")
+    if len(raw) >= compress_threshold:
+        return "z:" + base64.b85encode(zlib.compress(raw, 6)).decode("ascii")
+    return "j:" + payload
+
+def decode_session(blob: str) -> Dict:
+    if blob.startswith("z:"):
+        return _expand(json.loads(zlib.decompress(base64.b85decode(blob[2:])).decode("utf-8")))
+    if blob.startswith("j:"):
+        return _expand(json.loads(blob[2:]))
+    return json.loads(blob)
+
 class RedisSessionManager:
-    def __init__(self, ttl_hours: int = 24):
+    def __init__(self, ttl_hours: int = 24, compress_threshold: int = 512,
+                 active_window_minutes: int = 30, csrf_orphan_grace_minutes: int = 60,
+                 sweep_interval_seconds: int = 300):
         self.ttl = ttl_hours * 3600
+        self.compress_threshold = compress_threshold
+        self.active_window = active_window_minutes * 60
+        self.csrf_orphan_grace = csrf_orphan_grace_minutes * 60
+        # Expire the sweep lock just before the next round so every interval gets a sweep
+        self.sweep_lock_ttl = max(int(sweep_interval_seconds * 0.9), 1)
         
     def get_session(self, session_id: str) -> Optional[Dict]:
         try:
             data = redis_client.get(f"session:{session_id}")
             if data:
-                return json.loads(data)
+                return decode_session(data)
             return None
         except Exception as e:
             logging.error(f"Redis get error: {e}")
@@ -31,11 +86,12 @@ class RedisSessionManager:
     
     def set_session(self, session_id: str, data: Dict) -> bool:
         try:
-            redis_client.setex(
-                f"session:{session_id}", 
-                self.ttl, 
-                json.dumps(data, default=str)
-            )
+            blob = encode_session(data, self.compress_threshold)
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.setex(f"session:{session_id}", self.ttl, blob)
+            pipe.zadd(ACTIVE_SESSIONS_KEY, {session_id: time.time()})
+            pipe.execute()
+            track_session_write(len(blob.encode("utf-8")))
             return True
         except Exception as e:
             logging.error(f"Redis set error: {e}")
@@ -43,7 +99,10 @@ class RedisSessionManager:
     
     def delete_session(self, session_id: str) -> bool:
         try:
-            redis_client.delete(f"session:{session_id}")
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.delete(f"session:{session_id}", f"csrf:{session_id}")
+            pipe.zrem(ACTIVE_SESSIONS_KEY, session_id)
+            pipe.execute()
             return True
         except Exception as e:
             logging.error(f"Redis delete error: {e}")
@@ -53,7 +112,7 @@ class RedisSessionManager:
         try:
             key = f"csrf:{session_id}"
             token = redis_client.get(key)
-            logging.info(f"🔍 Redis GET csrf:{session_id[:8]} = {token[:10] if token else 'None'}...")
+            logging.debug("Redis GET csrf:%.8s found=%s", session_id, token is not None)
             return token
         except Exception as e:
             logging.error(f"Redis CSRF get error: {e}")
@@ -63,10 +122,97 @@ class RedisSessionManager:
         try:
             key = f"csrf:{session_id}"
             redis_client.setex(key, self.ttl, token)
-            logging.info(f"🔍 Redis SET csrf:{session_id[:8]} = {token[:10]}... (TTL: {self.ttl}s)")
+            logging.debug("Redis SET csrf:%.8s ttl=%ds", session_id, self.ttl)
             return True
         except Exception as e:
             logging.error(f"Redis CSRF set error: {e}")
             return False
 
-session_manager = RedisSessionManager()
\ No newline at end of file
+    def count_active_sessions(self) -> int:
+        """Sessions with activity inside the active window (one ZCOUNT)"""
+        try:
+            return redis_client.zcount(ACTIVE_SESSIONS_KEY, time.time() - self.active_window, "+inf")
+        except Exception as e:
+            logging.error(f"Redis active session count error: {e}")
+            return 0
+
+    def get_session_stats(self) -> Dict[str, int]:
+        """Latest totals written by the sweeper, shared by all workers"""
+        try:
+            stats = redis_client.hgetall(SESSION_STATS_KEY) or {}
+            return {key: int(value) for key, value in stats.items()}
+        except Exception as e:
+            logging.error(f"Redis session stats error: {e}")
+            return {}
+
+    def sweep(self, batch_size: int = 500) -> Optional[Dict[str, int]]:
+        """Drop expired sessions from the index, delete orphaned CSRF keys and
+        recompute session storage totals. Only one worker sweeps per interval."""
+        try:
+            if not redis_client.set(SWEEP_LOCK_KEY, "1", nx=True, ex=self.sweep_lock_ttl):
+                return None
+
+            # Anything idle longer than the TTL has already expired in Redis
+            expired = redis_client.zremrangebyscore(ACTIVE_SESSIONS_KEY, "-inf", time.time() - self.ttl)
+
+            stored_sessions = 0
+            stored_bytes = 0
+            session_ids = redis_client.zrangebyscore(ACTIVE_SESSIONS_KEY, "-inf", "+inf")
+            for start in range(0, len(session_ids), batch_size):
+                batch = session_ids[start:start + batch_size]
+                pipe = redis_client.pipeline(transaction=False)
+                for session_id in batch:
+                    pipe.strlen(f"session:{session_id}")
+                sizes = pipe.execute()
+                gone = [session_id for session_id, size in zip(batch, sizes) if not size]
+                if gone:
+                    redis_client.zrem(ACTIVE_SESSIONS_KEY, *gone)
+                    expired += len(gone)
+                stored_sessions += len(batch) - len(gone)
+                stored_bytes += sum(size for size in sizes if size)
+
+            # CSRF keys whose session never started (or already expired) after a grace period
+            orphaned = 0
+            csrf_keys = list(redis_client.scan_iter(match="csrf:*", count=batch_size))
+            for start in range(0, len(csrf_keys), batch_size):
+                batch = csrf_keys[start:start + batch_size]
+                pipe = redis_client.pipeline(transaction=False)
+                for key in batch:
+                    pipe.exists(f"session:{key[len('csrf:'):]}")
+                    pipe.ttl(key)
+                results = pipe.execute()
+                stale = [
+                    key for key, has_session, remaining in zip(batch, results[::2], results[1::2])
+                    if not has_session and remaining >= 0 and self.ttl - remaining > self.csrf_orphan_grace
+                ]
+                if stale:
+                    redis_client.delete(*stale)
+                    orphaned += len(stale)
+
+            stats = {
+                "stored_sessions": stored_sessions,
+                "stored_bytes": stored_bytes,
+                "expired": expired,
+                "orphaned_csrf": orphaned
+            }
+            redis_client.hset(SESSION_STATS_KEY, mapping=stats)
+            logging.info("Session sweep: %d stored (%d bytes), %d expired, %d orphaned CSRF keys removed",
+                         stored_sessions, stored_bytes, expired, orphaned)
+            return stats
+        except Exception as e:
+            logging.error(f"Redis session sweep error: {e}")
+            return None
+
+    def refresh_metrics(self) -> None:
+        update_active_sessions(self.count_active_sessions())
+        stats = self.get_session_stats()
+        if stats:
+            update_session_storage(stats.get("stored_sessions", 0), stats.get("stored_bytes", 0))
+
+session_manager = RedisSessionManager(
+    ttl_hours=settings["session_ttl_hours"],
+    compress_threshold=settings["session_compress_threshold"],
+    active_window_minutes=settings["session_active_window_minutes"],
+    csrf_orphan_grace_minutes=settings["csrf_orphan_grace_minutes"],
+    sweep_interval_seconds=settings["session_sweep_interval_seconds"]
+)
\ No newline at end of file
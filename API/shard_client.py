@@ -0,0 +1,108 @@
+import heapq
+import queue
+import socket
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Connection, answer_challenge, deliver_challenge
+from typing import Dict, List
+import logging
+
+import numpy as np
+
+from config.shards import (ShardSpec, ensure_socket_dir, pack_message, require_authkey, set_io_timeout,
+                           shard_address, unpack_message)
+
+class ShardedSearchClient:
+    """Scatter a query vector to every shard process and merge their top-k.
+
+    Requests are written to all shards before any reply is read, so shards
+    score in parallel without extra threads. Connections are pooled per shard
+    because queries arrive from the API threadpool. Messages are JSON plus a
+    raw float32 vector, never pickles. Connecting, the authkey handshake and
+    the replies all share one deadline, so a stalled shard is skipped rather
+    than holding the calling thread.
+    """
+
+    def __init__(self, shards: List[ShardSpec], socket_dir: str, authkey: str, timeout: float = 2.0):
+        self.socket_dir = socket_dir
+        self.addresses = {spec.name: shard_address(spec.name, socket_dir) for spec in shards}
+        self.authkey = require_authkey(authkey)
+        self.timeout = timeout
+        self._pools: Dict[str, queue.LifoQueue] = {name: queue.LifoQueue() for name in self.addresses}
+
+    def _acquire(self, name: str, deadline: float):
+        try:
+            return self._pools[name].get_nowait()
+        except queue.Empty:
+            return self._connect(name, deadline)
+
+    def _connect(self, name: str, deadline: float) -> Connection:
+        """multiprocessing.connection.Client, but with a bounded connect and handshake"""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"no connection within {self.timeout}s")
+        ensure_socket_dir(self.socket_dir)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(remaining)
+            sock.connect(self.addresses[name])
+            sock.settimeout(None)
+            conn = Connection(sock.detach())
+        finally:
+            sock.close()
+        try:
+            set_io_timeout(conn, max(deadline - time.monotonic(), 0.001))
+            answer_challenge(conn, self.authkey)
+            deliver_challenge(conn, self.authkey)
+            # poll() enforces the reply deadline; this only guards against a shard
+            # that stops mid-message
+            set_io_timeout(conn, self.timeout)
+        except BlockingIOError:
+            conn.close()
+            raise TimeoutError(f"no handshake within {self.timeout}s") from None
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    def _release(self, name: str, conn) -> None:
+        self._pools[name].put(conn)
+
+    def _scatter(self, request: bytes) -> List[Dict]:
+        pending = []
+        deadline = time.monotonic() + self.timeout
+        for name in self.addresses:
+            conn = None
+            try:
+                conn = self._acquire(name, deadline)
+                conn.send_bytes(request)
+                pending.append((name, conn))
+            except (OSError, EOFError, RuntimeError, AuthenticationError) as e:
+                logging.error(f"Shard {name} unavailable: {e}")
+                if conn is not None:
+                    conn.close()
+
+        replies = []
+        for name, conn in pending:
+            try:
+                if not conn.poll(max(deadline - time.monotonic(), 0)):
+                    raise TimeoutError(f"no reply within {self.timeout}s")
+                reply, _ = unpack_message(conn.recv_bytes())
+                self._release(name, conn)
+            except Exception as e:
+                logging.error(f"Shard {name} query failed: {e}")
+                conn.close()
+                continue
+            if "error" in reply:
+                logging.error(f"Shard {name} returned an error: {reply['error']}")
+                continue
+            replies.append(reply)
+        return replies
+
+    def search(self, vector: np.ndarray, k: int = 4) -> List[Dict]:
+        request = pack_message({"op": "search", "k": k}, np.asarray(vector, dtype=np.float32).tobytes())
+        matches = [match for reply in self._scatter(request) for match in reply.get("matches", [])]
+        return heapq.nlargest(k, matches, key=lambda match: match["score"])
+
+    def stats(self) -> List[Dict]:
+        return [reply["stats"] for reply in self._scatter(pack_message({"op": "stats"})) if "stats" in reply]
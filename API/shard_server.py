@@ -0,0 +1,202 @@
+"""Knowledge-base shard processes for SEARCH_MODE=sharded.
+
+Each shard holds the embeddings for its slice of the knowledge base and
+answers top-k queries over a local Unix socket, so API workers only keep
+the query encoder in memory. Start every shard listed in KB_SHARDS:
+
+    python shard_server.py
+
+or a single one (e.g. under a process manager):
+
+    python shard_server.py --shard funding
+"""
+import argparse
+import logging
+import os
+import resource
+import signal
+import threading
+from multiprocessing import Process
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, answer_challenge, deliver_challenge
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from config import get_settings
+from config.shards import (ShardSpec, ensure_socket_dir, pack_message, parse_kb_shards, require_authkey,
+                           set_io_timeout, shard_address, unpack_message)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+settings = get_settings()
+
+# A query is one header plus a 384-dim float32 vector; anything far larger is not a client of ours
+MAX_REQUEST_BYTES = 1 << 20
+# A client that connects but never completes the authkey handshake is dropped after this
+HANDSHAKE_TIMEOUT_SECONDS = 5.0
+
+class ShardServer:
+    """Exact cosine top-k over one shard's L2-normalised embedding matrix"""
+
+    def __init__(self, name: str, row_ids: Sequence, questions: Sequence[str],
+                 answers: Sequence[str], embeddings: np.ndarray):
+        self.name = name
+        self.row_ids = list(row_ids)
+        self.questions = list(questions)
+        self.answers = list(answers)
+        self.embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+
+    def search(self, vector: np.ndarray, k: int) -> List[Dict]:
+        if not len(self.row_ids):
+            return []
+        scores = self.embeddings @ vector
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            {
+                "score": float(scores[i]),
+                "row_id": self.row_ids[i],
+                "question": self.questions[i],
+                "answer": self.answers[i],
+                "shard": self.name
+            }
+            for i in top
+        ]
+
+    def stats(self) -> Dict:
+        return {
+            "shard": self.name,
+            "rows": len(self.row_ids),
+            "embedding_bytes": int(self.embeddings.nbytes),
+            "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        }
+
+    def _handle(self, conn, authkey: bytes):
+        with conn:
+            try:
+                set_io_timeout(conn, HANDSHAKE_TIMEOUT_SECONDS)
+                deliver_challenge(conn, authkey)
+                answer_challenge(conn, authkey)
+                set_io_timeout(conn, 0)
+            except (AuthenticationError, EOFError, OSError) as e:
+                logging.error(f"Shard {self.name} rejected a connection: {e}")
+                return
+            while True:
+                try:
+                    request, payload = unpack_message(conn.recv_bytes(MAX_REQUEST_BYTES))
+                except (EOFError, OSError):
+                    return
+                except ValueError as e:
+                    logging.error(f"Shard {self.name} received a malformed request: {e}")
+                    return
+                try:
+                    if request.get("op") == "search":
+                        vector = np.frombuffer(payload or b"", dtype=np.float32)
+                        reply = {"matches": self.search(vector, int(request.get("k", 4)))}
+                    elif request.get("op") == "stats":
+                        reply = {"stats": self.stats()}
+                    else:
+                        reply = {"error": f"unknown op {request.get('op')!r}"}
+                    conn.send_bytes(pack_message(reply))
+                except OSError:
+                    return
+                except Exception as e:
+                    logging.error(f"Shard {self.name} failed to handle request: {e}")
+                    try:
+                        conn.send_bytes(pack_message({"error": str(e)}))
+                    except OSError:
+                        return
+
+    def serve(self, address: str, authkey: bytes):
+        ensure_socket_dir(os.path.dirname(address), create=True)
+        if os.path.exists(address):
+            os.unlink(address)
+        # The authkey handshake runs in the per-connection thread, so a client that
+        # never answers cannot block accept() for everyone else
+        with Listener(address, family="AF_UNIX") as listener:
+            logging.info(f"Shard {self.name} serving {len(self.row_ids)} rows on {address}")
+            while True:
+                try:
+                    conn = listener.accept()
+                except OSError as e:
+                    logging.error(f"Shard {self.name} failed to accept a connection: {e}")
+                    continue
+                threading.Thread(target=self._handle, args=(conn, authkey), daemon=True).start()
+
+def load_shard(spec: ShardSpec) -> ShardServer:
+    """Embed the shard's rows; rows from the primary KB keep their integer row IDs"""
+    from sentence_transformers import SentenceTransformer
+
+    df = pd.read_csv(spec.source)
+    df = df.dropna(subset=["question", "answer"])
+    df["question"] = df["question"].astype(str)
+    if spec.partitions > 1:
+        df = df[df.index % spec.partitions == spec.partition]
+
+    if os.path.abspath(spec.source) == os.path.abspath(settings["kb_path"]):
+        row_ids = [int(i) for i in df.index]
+    else:
+        row_ids = [f"{spec.name}:{i}" for i in df.index]
+
+    model = SentenceTransformer("all-MiniLM-L6-v2")
+    embeddings = model.encode(list(df["question"]), convert_to_numpy=True, normalize_embeddings=True)
+    return ShardServer(spec.name, row_ids, df["question"], df["answer"].astype(str), embeddings)
+
+def synthetic_shard(name: str, rows: int, dim: int, seed: int = 0) -> ShardServer:
+    """Random normalised embeddings, for benchmarking without the model or a large KB"""
+    rng = np.random.default_rng(seed)
+    embeddings = rng.standard_normal((rows, dim), dtype=np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return ShardServer(name, [f"{name}:{i}" for i in range(rows)],
+                       [f"synthetic question {i}" for i in range(rows)],
+                       [f"synthetic answer {i}" for i in range(rows)], embeddings)
+
+def run_shard(spec: ShardSpec, synthetic_rows: Optional[int] = None, dim: int = 384, seed: int = 0,
+              socket_dir: Optional[str] = None):
+    if synthetic_rows is not None:
+        server = synthetic_shard(spec.name, synthetic_rows, dim, seed)
+    else:
+        server = load_shard(spec)
+    address = shard_address(spec.name, socket_dir or settings["shard_socket_dir"])
+    server.serve(address, require_authkey(settings["shard_authkey"]))
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve knowledge-base shards over local IPC")
+    parser.add_argument("--shard", help="Only start the shard with this name")
+    args = parser.parse_args()
+
+    try:
+        require_authkey(settings["shard_authkey"])
+    except RuntimeError as e:
+        raise SystemExit(str(e))
+
+    shards = parse_kb_shards(settings["kb_shards"], settings["kb_path"])
+    if args.shard:
+        shards = [spec for spec in shards if spec.name == args.shard]
+        if not shards:
+            raise SystemExit(f"No shard named {args.shard!r} in KB_SHARDS")
+    if len(shards) == 1:
+        run_shard(shards[0])
+        return
+
+    processes = [Process(target=run_shard, args=(spec,), name=f"shard-{spec.name}") for spec in shards]
+    for process in processes:
+        process.start()
+
+    def stop(signum, frame):
+        for process in processes:
+            process.terminate()
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for process in processes:
+        process.join()
+
+if __name__ == "__main__":
+    main()
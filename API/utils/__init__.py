@@ -1,10 +1,11 @@
-from .validation import sanitize_for_logging, validate_audio_file
+from .validation import sanitize_for_logging, validate_audio_file, normalize_query
 from .security import generate_csrf_token, validate_csrf_token
 from .encryption import encrypt_data, decrypt_data
 
 __all__ = [
     "sanitize_for_logging",
     "validate_audio_file", 
+    "normalize_query",
     "generate_csrf_token",
     "validate_csrf_token",
     "encrypt_data",
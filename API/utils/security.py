@@ -9,16 +9,11 @@ def validate_csrf_token(token: str, session_id: str) -> bool:
     import logging
     from services.session_service import session_manager
     
-    logging.info(f"🔍 Validating CSRF token for session {session_id[:8]}")
-    logging.info(f"🔍 Received token: {token[:10]}...")
-    
     stored_token = session_manager.get_csrf_token(session_id)
-    logging.info(f"🔍 Stored token: {stored_token[:10] if stored_token else 'None'}...")
-    
     if not stored_token:
-        logging.error(f"❌ No CSRF token found in Redis for session {session_id[:8]}")
+        logging.warning("No CSRF token found in Redis for session %.8s", session_id)
         return False
     
     is_valid = stored_token == token
-    logging.info(f"{'✅' if is_valid else '❌'} CSRF token validation result: {is_valid}")
+    logging.debug("CSRF token validation for session %.8s: %s", session_id, is_valid)
     return is_valid
\ No newline at end of file
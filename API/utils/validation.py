@@ -11,6 +11,13 @@ def sanitize_for_logging(text: str, max_length: int = 100) -> str:
         sanitized = sanitized[:max_length] + "..."
     return sanitized
 
+def normalize_query(text: str) -> str:
+    """Normalize user query so trivially different phrasings compare equal"""
+    if not text:
+        return ""
+    normalized = re.sub(r'\s+', ' ', str(text)).strip().lower()
+    return normalized.rstrip('?.!।॥ ')
+
 def validate_audio_file(file: UploadFile) -> bool:
     """Validate audio file type and size"""
     ALLOWED_EXTENSIONS = {'.wav', '.mp3', '.webm', '.ogg', '.m4a'}
@@ -1,24 +1,149 @@
-import React, { useEffect, useRef, useCallback } from 'react';
+import React, { useEffect, useLayoutEffect, useRef, useCallback, useMemo, useState } from 'react';
 import MessageBubble, { Message } from './MessageBubble';
 
 interface MessageAreaProps {
   messages: Message[];
 }
 
+// Only the bubbles inside the viewport (plus a small overscan) are mounted;
+// the rest of the history is represented by spacer padding.
+const ESTIMATED_ROW_HEIGHT = 88;
+const OVERSCAN_ROWS = 6;
+const STICK_TO_BOTTOM_THRESHOLD = 80;
+
+interface MeasuredRowProps {
+  message: Message;
+  onHeight: (id: string, height: number) => void;
+}
+
+const MeasuredRow = React.memo(({ message, onHeight }: MeasuredRowProps) => {
+  const rowRef = useRef<HTMLDivElement>(null);
+
+  useLayoutEffect(() => {
+    const node = rowRef.current;
+    if (!node) return;
+    onHeight(message.id, node.offsetHeight);
+    if (typeof ResizeObserver === 'undefined') return;
+    const observer = new ResizeObserver(() => onHeight(message.id, node.offsetHeight));
+    observer.observe(node);
+    return () => observer.disconnect();
+  }, [message.id, onHeight]);
+
+  return (
+    <div ref={rowRef} className="flow-root">
+      <MessageBubble message={message} />
+    </div>
+  );
+});
+
+// Index of the last row whose top offset is <= target
+const findRow = (offsets: number[], target: number) => {
+  let low = 0;
+  let high = offsets.length - 2;
+  while (low < high) {
+    const mid = Math.ceil((low + high) / 2);
+    if (offsets[mid] <= target) low = mid;
+    else high = mid - 1;
+  }
+  return Math.max(low, 0);
+};
+
 const MessageArea: React.FC<MessageAreaProps> = ({ messages }) => {
-  const messagesEndRef = useRef<HTMLDivElement>(null);
+  const scrollRef = useRef<HTMLDivElement>(null);
+  const listRef = useRef<HTMLDivElement>(null);
+  const heightsRef = useRef(new Map<string, number>());
+  const stickToBottomRef = useRef(true);
+  const previousCountRef = useRef(0);
+  const frameRef = useRef<number | null>(null);
+  const [layoutVersion, setLayoutVersion] = useState(0);
+  const [viewport, setViewport] = useState({ top: 0, height: 0 });
 
-  const scrollToBottom = useCallback(() => {
-    messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
+  const handleHeight = useCallback((id: string, height: number) => {
+    if (heightsRef.current.get(id) === height) return;
+    heightsRef.current.set(id, height);
+    setLayoutVersion(version => version + 1);
+  }, []);
+
+  // offsets[i] is the top of row i; offsets[messages.length] is the total height
+  const offsets = useMemo(() => {
+    const result = new Array<number>(messages.length + 1);
+    result[0] = 0;
+    messages.forEach((message, index) => {
+      result[index + 1] = result[index] + (heightsRef.current.get(message.id) ?? ESTIMATED_ROW_HEIGHT);
+    });
+    return result;
+    // layoutVersion changes whenever a measured height changes
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [messages, layoutVersion]);
+
+  const updateViewport = useCallback(() => {
+    frameRef.current = null;
+    const container = scrollRef.current;
+    if (!container) return;
+    const listTop = listRef.current?.offsetTop ?? 0;
+    const distanceFromBottom = container.scrollHeight - container.scrollTop - container.clientHeight;
+    stickToBottomRef.current = distanceFromBottom < STICK_TO_BOTTOM_THRESHOLD;
+    setViewport(prev => {
+      const next = { top: container.scrollTop - listTop, height: container.clientHeight };
+      return prev.top === next.top && prev.height === next.height ? prev : next;
+    });
+  }, []);
+
+  const handleScroll = useCallback(() => {
+    if (frameRef.current === null) {
+      frameRef.current = requestAnimationFrame(updateViewport);
+    }
+  }, [updateViewport]);
+
+  const scrollToBottom = useCallback((behavior: ScrollBehavior) => {
+    const container = scrollRef.current;
+    if (container) {
+      container.scrollTo({ top: container.scrollHeight, behavior });
+    }
   }, []);
 
   useEffect(() => {
-    scrollToBottom();
+    updateViewport();
+    window.addEventListener('resize', handleScroll);
+    return () => {
+      window.removeEventListener('resize', handleScroll);
+      if (frameRef.current !== null) cancelAnimationFrame(frameRef.current);
+    };
+  }, [updateViewport, handleScroll]);
+
+  // Follow new messages while the user is at the bottom; jump when a chat is loaded
+  useEffect(() => {
+    const previousCount = previousCountRef.current;
+    previousCountRef.current = messages.length;
+    if (messages.length === 0 || messages.length < previousCount) {
+      stickToBottomRef.current = true;
+      return;
+    }
+    if (previousCount === 0 || messages.length - previousCount > 2) {
+      stickToBottomRef.current = true;
+      scrollToBottom('auto');
+    } else if (stickToBottomRef.current || messages[messages.length - 1].isOutgoing) {
+      stickToBottomRef.current = true;
+      scrollToBottom('smooth');
+    }
   }, [messages, scrollToBottom]);
 
+  // Measured heights can grow the list after a scroll; keep the bottom pinned
+  useLayoutEffect(() => {
+    if (stickToBottomRef.current) {
+      scrollToBottom('auto');
+    }
+  }, [layoutVersion, scrollToBottom]);
+
+  const total = offsets[messages.length];
+  const start = messages.length ? Math.max(findRow(offsets, viewport.top) - OVERSCAN_ROWS, 0) : 0;
+  const end = messages.length
+    ? Math.min(findRow(offsets, viewport.top + viewport.height) + OVERSCAN_ROWS, messages.length - 1)
+    : -1;
+
   return (
-    <div className="flex-1 overflow-y-auto px-4 py-6 bg-gray-50">
-      <div className="max-w-4xl mx-auto">
+    <div ref={scrollRef} onScroll={handleScroll} className="relative flex-1 overflow-y-auto px-4 py-6 bg-gray-50">
+      <div ref={listRef} className="max-w-4xl mx-auto">
         {messages.length === 0 ? (
           <div className="flex items-center justify-center min-h-[60vh]">
             <div className="text-center">
@@ -34,14 +159,15 @@ const MessageArea: React.FC<MessageAreaProps> = ({ messages }) => {
             </div>
           </div>
         ) : (
-          messages.map((message) => (
-            <MessageBubble key={message.id} message={message} />
-          ))
+          <div style={{ paddingTop: offsets[start], paddingBottom: total - offsets[end + 1] }}>
+            {messages.slice(start, end + 1).map((message) => (
+              <MeasuredRow key={message.id} message={message} onHeight={handleHeight} />
+            ))}
+          </div>
         )}
-        <div ref={messagesEndRef} />
       </div>
     </div>
   );
 };
 
-export default MessageArea;
\ No newline at end of file
+export default MessageArea;
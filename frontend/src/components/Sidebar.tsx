@@ -6,7 +6,6 @@ interface ChatSession {
   title: string;
   lastMessage: string;
   timestamp: Date;
-  messages: Message[];
 }
 
 interface SidebarProps {
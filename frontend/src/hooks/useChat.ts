@@ -1,9 +1,11 @@
-import { useState, useCallback, useEffect } from 'react';
+import { useState, useCallback, useEffect, useRef } from 'react';
 import { Message } from '../components/MessageBubble';
 import { ChatSession } from '../components/Sidebar';
 import { SecureApiClient } from '../utils/apiClient';
+import { loadSessions, loadMessages, appendMessages, deleteSessions } from '../utils/chatStorage';
 
 const API_BASE_URL = 'http://localhost:8000';
+const MAX_CHAT_SESSIONS = 10;
 
 const useChat = () => {
   const [messages, setMessages] = useState<Message[]>([]);
@@ -13,33 +15,23 @@ const useChat = () => {
 
   const [chatSessions, setChatSessions] = useState<ChatSession[]>([]);
 
-  // Load chat sessions from localStorage on mount
-  useEffect(() => {
-    try {
-      const savedSessions = localStorage.getItem('chatSessions');
-      if (savedSessions) {
-        const parsedSessions = JSON.parse(savedSessions).map((session: any) => ({
-          ...session,
-          timestamp: new Date(session.timestamp),
-          messages: Array.isArray(session.messages) ? session.messages.map((msg: any) => ({
-            ...msg,
-            timestamp: new Date(msg.timestamp)
-          })) : []
-        }));
-        setChatSessions(parsedSessions);
-      }
-    } catch (error) {
-      console.error('Error loading chat sessions:', error);
-      // Clear corrupted data
-      localStorage.removeItem('chatSessions');
-      setChatSessions([]);
-    }
-  }, []);
+  // Session whose messages should be on screen; guards against out-of-order loads
+  const selectedSessionRef = useRef<string | null>(sessionId);
 
-  // Save chat sessions to localStorage
-  const saveChatSessions = useCallback((sessions: ChatSession[]) => {
-    localStorage.setItem('chatSessions', JSON.stringify(sessions));
-    setChatSessions(sessions);
+  // Load chat session summaries on mount; messages are loaded per chat in selectChat
+  useEffect(() => {
+    let cancelled = false;
+    loadSessions()
+      .then(sessions => {
+        if (!cancelled) setChatSessions(sessions);
+      })
+      .catch(error => {
+        console.error('Error loading chat sessions:', error);
+        if (!cancelled) setChatSessions([]);
+      });
+    return () => {
+      cancelled = true;
+    };
   }, []);
 
   const generateId = useCallback(() => {
@@ -55,12 +47,42 @@ const useChat = () => {
     };
     
     setMessages(prev => [...prev, newMessage]);
-    return newMessage.id;
+    return newMessage;
   }, [generateId]);
 
+  // Persist one question/answer pair: two message appends plus a summary update
+  const saveExchange = useCallback((chatSessionId: string, text: string, userMessage: Message, botMessage: Message) => {
+    const lastMessage = botMessage.text.length > 50 ? botMessage.text.substring(0, 50) + '...' : botMessage.text;
+    const existingSession = chatSessions.find(s => s.id === chatSessionId);
+    let updatedSessions: ChatSession[];
+    let session: ChatSession;
+
+    if (existingSession) {
+      // Update existing session
+      session = { ...existingSession, lastMessage, timestamp: new Date() };
+      updatedSessions = chatSessions.map(s => (s.id === chatSessionId ? session : s));
+    } else {
+      // Create new session
+      session = {
+        id: chatSessionId,
+        title: text.length > 30 ? text.substring(0, 30) + '...' : text,
+        lastMessage,
+        timestamp: new Date(),
+      };
+      updatedSessions = [session, ...chatSessions];
+    }
+
+    const pruned = updatedSessions.slice(MAX_CHAT_SESSIONS).map(s => s.id);
+    setChatSessions(updatedSessions.slice(0, MAX_CHAT_SESSIONS));
+
+    appendMessages(session, [userMessage, botMessage])
+      .then(() => deleteSessions(pruned))
+      .catch(error => console.error('Error saving chat session:', error));
+  }, [chatSessions]);
+
   const sendMessage = useCallback(async (text: string) => {
     // Add user message
-    addMessage(text, true);
+    const userMessage = addMessage(text, true);
     
     // Show typing indicator
     setIsTyping(true);
@@ -73,6 +95,7 @@ const useChat = () => {
       if (!currentSessionId) {
         const csrfData = await SecureApiClient.getCsrfToken();
         currentSessionId = csrfData.session_id;
+        selectedSessionRef.current = currentSessionId;
         setSessionId(currentSessionId);
         localStorage.setItem('currentSessionId', currentSessionId);
       }
@@ -80,42 +103,10 @@ const useChat = () => {
       const data = await SecureApiClient.secureQuery(text, currentSessionId, null);
       
       // Add bot response
-      const botMessageId = addMessage(data.answer, false);
+      const botMessage = addMessage(data.answer, false);
       
-      const finalSessionId = currentSessionId;
-      
-      // Get current session messages
-      const currentSession = finalSessionId ? chatSessions.find(s => s.id === finalSessionId) : null;
-      const existingMessages = currentSession?.messages || [];
-      const userMessage = { id: generateId(), text: text, isOutgoing: true, timestamp: new Date() };
-      const botMessage = { id: botMessageId, text: data.answer, isOutgoing: false, timestamp: new Date() };
-      const allMessages = [...existingMessages, userMessage, botMessage];
-      
-      if (finalSessionId) {
-        const existingSessionIndex = chatSessions.findIndex(s => s.id === finalSessionId);
-        
-        if (existingSessionIndex >= 0) {
-          // Update existing session
-          const updatedSessions = [...chatSessions];
-          updatedSessions[existingSessionIndex] = {
-            ...updatedSessions[existingSessionIndex],
-            lastMessage: data.answer.length > 50 ? data.answer.substring(0, 50) + '...' : data.answer,
-            timestamp: new Date(),
-            messages: allMessages
-          };
-          saveChatSessions(updatedSessions);
-        } else {
-          // Create new session
-          const newSession: ChatSession = {
-            id: finalSessionId,
-            title: text.length > 30 ? text.substring(0, 30) + '...' : text,
-            lastMessage: data.answer.length > 50 ? data.answer.substring(0, 50) + '...' : data.answer,
-            timestamp: new Date(),
-            messages: allMessages
-          };
-          const updatedSessions = [newSession, ...chatSessions].slice(0, 10);
-          saveChatSessions(updatedSessions);
-        }
+      if (currentSessionId) {
+        saveExchange(currentSessionId, text, userMessage, botMessage);
       }
       
       setIsTyping(false);
@@ -135,52 +126,53 @@ const useChat = () => {
       
       addMessage(errorMessage, false);
     }
-  }, [addMessage, sessionId, csrfToken, chatSessions, saveChatSessions, generateId]);
+  }, [addMessage, sessionId, csrfToken, saveExchange]);
 
   const createNewChat = useCallback(() => {
+    selectedSessionRef.current = null;
     setMessages([]);
     setSessionId(null);
     setCsrfToken(null);
     localStorage.removeItem('currentSessionId');
   }, []);
 
-  const selectChat = useCallback((chatSessionId: string) => {
+  const selectChat = useCallback(async (chatSessionId: string) => {
+    selectedSessionRef.current = chatSessionId;
+    setMessages([]);
+    setSessionId(chatSessionId);
+    localStorage.setItem('currentSessionId', chatSessionId);
+    setCsrfToken(null); // Clear CSRF token for existing session
+
     try {
-      const selectedSession = chatSessions.find(session => session.id === chatSessionId);
-      if (selectedSession) {
-        // Ensure messages is an array
-        const messages = Array.isArray(selectedSession.messages) ? selectedSession.messages : [];
-        setMessages(messages);
-        setSessionId(chatSessionId);
-        localStorage.setItem('currentSessionId', chatSessionId);
-        setCsrfToken(null); // Clear CSRF token for existing session
-      } else {
-        // If session not found, start fresh
-        setMessages([]);
-        setSessionId(chatSessionId);
-        localStorage.setItem('currentSessionId', chatSessionId);
-        setCsrfToken(null);
+      // Lazy-load only this chat's messages
+      const messages = await loadMessages(chatSessionId);
+      if (selectedSessionRef.current === chatSessionId) {
+        setMessages(prev => [...messages, ...prev]);
       }
     } catch (error) {
       console.error('Error selecting chat:', error);
       // Fallback to empty state
-      setMessages([]);
-      setSessionId(null);
-      localStorage.removeItem('currentSessionId');
-      setCsrfToken(null);
+      if (selectedSessionRef.current === chatSessionId) {
+        selectedSessionRef.current = null;
+        setMessages([]);
+        setSessionId(null);
+        localStorage.removeItem('currentSessionId');
+        setCsrfToken(null);
+      }
     }
-  }, [chatSessions]);
+  }, []);
 
   const deleteChat = useCallback((chatSessionId: string) => {
-    const updatedSessions = chatSessions.filter(session => session.id !== chatSessionId);
-    saveChatSessions(updatedSessions);
+    setChatSessions(chatSessions.filter(session => session.id !== chatSessionId));
+    deleteSessions([chatSessionId]).catch(error => console.error('Error deleting chat session:', error));
     
     // If deleting current chat, start new chat
     if (sessionId === chatSessionId) {
+      selectedSessionRef.current = null;
       setMessages([]);
       setSessionId(null);
     }
-  }, [chatSessions, sessionId, saveChatSessions]);
+  }, [chatSessions, sessionId]);
 
   return {
     messages,
@@ -0,0 +1,197 @@
+// Incremental chat persistence backed by IndexedDB.
+//
+// Session summaries and messages live in separate object stores so that a
+// new reply costs one message write plus one small summary update, and a
+// session's messages are only read when that chat is opened.
+import type { Message } from '../components/MessageBubble';
+import type { ChatSession } from '../components/Sidebar';
+
+const DB_NAME = 'marathi-chatbot';
+const DB_VERSION = 1;
+const SESSIONS_STORE = 'sessions';
+const MESSAGES_STORE = 'messages';
+const LEGACY_STORAGE_KEY = 'chatSessions';
+
+interface StoredSession {
+  id: string;
+  title: string;
+  lastMessage: string;
+  timestamp: number;
+}
+
+interface StoredMessage {
+  id: string;
+  sessionId: string;
+  seq: number;
+  text: string;
+  isOutgoing: boolean;
+  timestamp: number;
+}
+
+let dbPromise: Promise<IDBDatabase> | null = null;
+
+const requestToPromise = <T>(request: IDBRequest<T>): Promise<T> =>
+  new Promise((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+
+const transactionDone = (tx: IDBTransaction): Promise<void> =>
+  new Promise((resolve, reject) => {
+    tx.oncomplete = () => resolve();
+    tx.onerror = () => reject(tx.error);
+    tx.onabort = () => reject(tx.error);
+  });
+
+const openDb = (): Promise<IDBDatabase> => {
+  if (!dbPromise) {
+    dbPromise = new Promise((resolve, reject) => {
+      if (typeof indexedDB === 'undefined') {
+        reject(new Error('IndexedDB is not available'));
+        return;
+      }
+      const request = indexedDB.open(DB_NAME, DB_VERSION);
+      request.onupgradeneeded = () => {
+        const db = request.result;
+        if (!db.objectStoreNames.contains(SESSIONS_STORE)) {
+          db.createObjectStore(SESSIONS_STORE, { keyPath: 'id' });
+        }
+        if (!db.objectStoreNames.contains(MESSAGES_STORE)) {
+          const messages = db.createObjectStore(MESSAGES_STORE, { keyPath: 'id' });
+          messages.createIndex('bySession', ['sessionId', 'seq']);
+        }
+      };
+      request.onsuccess = () => resolve(request.result);
+      request.onerror = () => reject(request.error);
+    });
+    dbPromise.catch(() => {
+      dbPromise = null;
+    });
+  }
+  return dbPromise;
+};
+
+const toSession = (stored: StoredSession): ChatSession => ({
+  ...stored,
+  timestamp: new Date(stored.timestamp),
+});
+
+const fromSession = (session: ChatSession): StoredSession => ({
+  id: session.id,
+  title: session.title,
+  lastMessage: session.lastMessage,
+  timestamp: new Date(session.timestamp).getTime(),
+});
+
+const toMessage = (stored: StoredMessage): Message => ({
+  id: stored.id,
+  text: stored.text,
+  isOutgoing: stored.isOutgoing,
+  timestamp: new Date(stored.timestamp),
+});
+
+const sessionRange = (sessionId: string) =>
+  IDBKeyRange.bound([sessionId, -Infinity], [sessionId, Infinity]);
+
+// One-time move of the old localStorage blob into IndexedDB
+const migrateLegacySessions = async (db: IDBDatabase) => {
+  const legacy = localStorage.getItem(LEGACY_STORAGE_KEY);
+  if (!legacy) return;
+
+  let tx: IDBTransaction | undefined;
+  try {
+    const sessions = JSON.parse(legacy);
+    tx = db.transaction([SESSIONS_STORE, MESSAGES_STORE], 'readwrite');
+    const sessionStore = tx.objectStore(SESSIONS_STORE);
+    const messageStore = tx.objectStore(MESSAGES_STORE);
+    for (const session of Array.isArray(sessions) ? sessions : []) {
+      sessionStore.put({
+        id: session.id,
+        title: session.title ?? '',
+        lastMessage: session.lastMessage ?? '',
+        timestamp: new Date(session.timestamp).getTime() || Date.now(),
+      });
+      (Array.isArray(session.messages) ? session.messages : []).forEach((msg: any, seq: number) => {
+        messageStore.put({
+          id: msg.id,
+          sessionId: session.id,
+          seq,
+          text: msg.text,
+          isOutgoing: Boolean(msg.isOutgoing),
+          timestamp: new Date(msg.timestamp).getTime() || Date.now(),
+        });
+      });
+    }
+    await transactionDone(tx);
+    localStorage.removeItem(LEGACY_STORAGE_KEY);
+  } catch (error) {
+    // Keep the legacy entry so the migration is retried on the next load
+    console.error('Error migrating chat sessions:', error);
+    try {
+      tx?.abort();
+    } catch {
+      // Already finished or aborted
+    }
+  }
+};
+
+export const loadSessions = async (): Promise<ChatSession[]> => {
+  const db = await openDb();
+  await migrateLegacySessions(db);
+  const tx = db.transaction(SESSIONS_STORE, 'readonly');
+  const sessions = await requestToPromise<StoredSession[]>(tx.objectStore(SESSIONS_STORE).getAll());
+  return sessions.sort((a, b) => b.timestamp - a.timestamp).map(toSession);
+};
+
+export const loadMessages = async (sessionId: string): Promise<Message[]> => {
+  const db = await openDb();
+  const tx = db.transaction(MESSAGES_STORE, 'readonly');
+  const index = tx.objectStore(MESSAGES_STORE).index('bySession');
+  const messages = await requestToPromise<StoredMessage[]>(index.getAll(sessionRange(sessionId)));
+  return messages.map(toMessage);
+};
+
+// Appends messages after the session's last stored one and updates its summary
+export const appendMessages = async (session: ChatSession, messages: Message[]): Promise<void> => {
+  const db = await openDb();
+  const tx = db.transaction([SESSIONS_STORE, MESSAGES_STORE], 'readwrite');
+  const messageStore = tx.objectStore(MESSAGES_STORE);
+  tx.objectStore(SESSIONS_STORE).put(fromSession(session));
+
+  const cursorRequest = messageStore.index('bySession').openKeyCursor(sessionRange(session.id), 'prev');
+  cursorRequest.onsuccess = () => {
+    const cursor = cursorRequest.result;
+    const lastSeq = cursor ? (cursor.key as [string, number])[1] : -1;
+    messages.forEach((msg, offset) => {
+      messageStore.put({
+        id: msg.id,
+        sessionId: session.id,
+        seq: lastSeq + 1 + offset,
+        text: msg.text,
+        isOutgoing: msg.isOutgoing,
+        timestamp: new Date(msg.timestamp).getTime(),
+      });
+    });
+  };
+  await transactionDone(tx);
+};
+
+export const deleteSessions = async (sessionIds: string[]): Promise<void> => {
+  if (sessionIds.length === 0) return;
+  const db = await openDb();
+  const tx = db.transaction([SESSIONS_STORE, MESSAGES_STORE], 'readwrite');
+  const sessionStore = tx.objectStore(SESSIONS_STORE);
+  const index = tx.objectStore(MESSAGES_STORE).index('bySession');
+  for (const sessionId of sessionIds) {
+    sessionStore.delete(sessionId);
+    const cursorRequest = index.openCursor(sessionRange(sessionId));
+    cursorRequest.onsuccess = () => {
+      const cursor = cursorRequest.result;
+      if (cursor) {
+        cursor.delete();
+        cursor.continue();
+      }
+    };
+  }
+  await transactionDone(tx);
+};